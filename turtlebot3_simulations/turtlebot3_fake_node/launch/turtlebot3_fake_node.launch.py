@@ -16,18 +16,42 @@
 
 import os
 
-from ament_index_python.packages import get_package_share_directory
+from ament_index_python.packages import get_package_share_directory, PackageNotFoundError
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument
 from launch.actions import IncludeLaunchDescription
 from launch.actions import LogInfo
+from launch.conditions import IfCondition
 from launch.launch_description_sources import PythonLaunchDescriptionSource
-from launch.substitutions import LaunchConfiguration
+from launch.substitutions import LaunchConfiguration, PythonExpression
 from launch_ros.actions import Node
 
 TURTLEBOT3_MODEL = os.environ['TURTLEBOT3_MODEL']
 
 
+def fake_lidar(world, x_pose, y_pose):
+    # fake_lidar.py ships with turtlebot3_gazebo, which is not a dependency of this package
+    # (it pulls in the whole gz / ros_gz stack): without it there is no /scan
+    has_world = IfCondition(PythonExpression(["'", world, "' != ''"]))
+    try:
+        get_package_share_directory('turtlebot3_gazebo')
+    except PackageNotFoundError:
+        return LogInfo(
+            msg='turtlebot3_gazebo is not installed: no fake lidar, world:= is ignored',
+            condition=has_world)
+    return Node(
+        package='turtlebot3_gazebo',
+        executable='fake_lidar.py',
+        parameters=[{
+            'world': world,
+            'model': TURTLEBOT3_MODEL,
+            'x_pose': x_pose,
+            'y_pose': y_pose,
+        }],
+        output='screen',
+        condition=has_world)
+
+
 def generate_launch_description():
     param_dir = LaunchConfiguration(
         'param_dir',
@@ -42,6 +66,9 @@ def generate_launch_description():
             get_package_share_directory('turtlebot3_fake_node'), 'launch'))
 
     use_sim_time = LaunchConfiguration('use_sim_time', default='false')
+    world = LaunchConfiguration('world', default='')
+    x_pose = LaunchConfiguration('x_pose', default='0.0')
+    y_pose = LaunchConfiguration('y_pose', default='0.0')
     urdf_file_name = 'turtlebot3_' + TURTLEBOT3_MODEL + '.urdf'
 
     urdf = os.path.join(
@@ -57,6 +84,21 @@ def generate_launch_description():
             default_value=param_dir,
             description='Specifying parameter direction'),
 
+        DeclareLaunchArgument(
+            'world',
+            default_value=world,
+            description='World file whose walls the fake lidar sees (no scan if empty; needs turtlebot3_gazebo)'),
+
+        DeclareLaunchArgument(
+            'x_pose',
+            default_value=x_pose,
+            description='World x of the robot at start, for the fake lidar'),
+
+        DeclareLaunchArgument(
+            'y_pose',
+            default_value=y_pose,
+            description='World y of the robot at start, for the fake lidar'),
+
         IncludeLaunchDescription(
             PythonLaunchDescriptionSource([rviz_dir, '/rviz2.launch.py'])),
 
@@ -66,6 +108,8 @@ def generate_launch_description():
             parameters=[param_dir],
             output='screen'),
 
+        fake_lidar(world, x_pose, y_pose),
+
         Node(
             package='robot_state_publisher',
             executable='robot_state_publisher',
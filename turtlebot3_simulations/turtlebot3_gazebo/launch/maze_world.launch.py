@@ -16,14 +16,139 @@
 #
 # Authors: Joep Tool
 
+import json
 import os
+import sys
+import tempfile
+import time
 
 from ament_index_python.packages import get_package_share_directory
 from launch import LaunchDescription
 from launch.actions import AppendEnvironmentVariable
 from launch.actions import IncludeLaunchDescription
+from launch.actions import OpaqueFunction
+from launch.actions import RegisterEventHandler
+from launch.conditions import IfCondition
+from launch.conditions import UnlessCondition
+from launch.event_handlers import OnProcessExit, OnProcessIO, OnProcessStart, OnShutdown
+from launch.launch_description_sources import load_python_launch_file_as_module
 from launch.launch_description_sources import PythonLaunchDescriptionSource
-from launch.substitutions import LaunchConfiguration
+from launch.substitutions import LaunchConfiguration, PythonExpression
+from launch_ros.actions import Node
+
+sys.path.append(os.path.join(get_package_share_directory('turtlebot3_gazebo'), 'worlds'))
+from physics_profiles import with_physics_profile  # noqa: E402
+
+
+class StartupTimeline:
+    """
+    Wall-clock bringup timeline (timeline:=true): when each action starts, when every process is up
+    and when it exits, and when the first message arrives on clock, odom and scan (startup_probe.py).
+    Printed at shutdown, and written as JSON to timeline_file if set.
+    """
+    def __init__(self, condition):
+        self.condition = condition
+        self.start = time.time()
+        self.events = [(self.start, 'launch description generated')]
+
+    def mark(self, label, stamp=None):
+        self.events.append((time.time() if stamp is None else stamp, label))
+
+    def marker(self, label):
+        return OpaqueFunction(function=lambda context: self.mark(f'{label} action started'), condition=self.condition)
+
+    def probe_output(self, event):
+        for line in event.text.decode().splitlines():
+            fields = line.split()
+            if len(fields) == 3 and fields[0] == 'first_message':
+                self.mark(f'first message on {fields[1]}', float(fields[2]))
+
+    def report(self, context, timeline_file):
+        events = [(stamp - self.start, label) for stamp, label in sorted(self.events)]
+        print('\nStartup timeline [s]:')
+        previous = 0.0
+        for offset, label in events:
+            print(f'{offset:9.3f} (+{offset - previous:7.3f})  {label}')
+            previous = offset
+        path = timeline_file.perform(context)
+        if path:
+            with open(path, 'w') as file:
+                json.dump([{'time': offset, 'event': label} for offset, label in events], file, indent=2)
+            print(f'Startup timeline written to {path}')
+
+    def actions(self, timeline_file):
+        probe = Node(
+            package='turtlebot3_gazebo',
+            executable='startup_probe.py',
+            name='startup_probe',
+            output='log',
+            condition=self.condition
+        )
+        handlers = [
+            OnProcessStart(on_start=lambda event, context: self.mark(f'{event.name} process up (pid {event.pid})')),
+            OnProcessExit(on_exit=lambda event, context: self.mark(f'{event.name} exited ({event.returncode})')),
+            OnProcessIO(target_action=probe, on_stdout=self.probe_output),
+            OnShutdown(on_shutdown=lambda event, context: self.report(context, timeline_file)),
+        ]
+        return [RegisterEventHandler(handler, condition=self.condition) for handler in handlers] + [probe]
+
+
+def remove_on_shutdown(path):
+    # Temporary files written for this launch are deleted when it shuts down
+    def remove(event, context):
+        if os.path.exists(path):
+            os.remove(path)
+    return RegisterEventHandler(OnShutdown(on_shutdown=remove))
+
+
+def world_with_physics(context, world, physics):
+    # physics:=<profile> runs a temporary copy of the world with that profile's <physics> settings
+    path = world.perform(context)
+    profile = physics.perform(context)
+    if not profile:
+        return path
+    with open(path, newline='') as file:
+        text = with_physics_profile(file.read(), profile)
+    with tempfile.NamedTemporaryFile('w', suffix=f'_{profile}.world', delete=False, newline='') as file:
+        file.write(text)
+    return file.name
+
+
+def start_gzserver(context, ros_gz_sim, world, physics, gzserver_flags):
+    path = world_with_physics(context, world, physics)
+    actions = [IncludeLaunchDescription(
+        PythonLaunchDescriptionSource(
+            os.path.join(ros_gz_sim, 'launch', 'gz_sim.launch.py')
+        ),
+        launch_arguments={
+            'gz_args': ['-r -s ', gzserver_flags, ' ', path],
+            'on_exit_shutdown': 'true'
+        }.items()
+    )] # launch gazebo server with world file
+    if path != world.perform(context):
+        actions.append(remove_on_shutdown(path))
+    return actions
+
+
+def start_thermal_sensors(context, launch_file_dir, heat_field, robots, x_pose, y_pose, use_sim_time):
+    # One thermal sensor per robot, in its namespace: it reads <namespace>/odom, offset by that
+    # robot's spawn pose, and stamps readings with the robot's own (prefixed) base_footprint
+    spawn = load_python_launch_file_as_module(os.path.join(launch_file_dir, 'spawn_turtlebot3.launch.py'))
+    robots = spawn.robot_namespaces(robots.perform(context), x_pose.perform(context), y_pose.perform(context))
+    return [Node(
+        package='turtlebot3_gazebo',
+        executable='thermal_sensor.py',
+        name='thermal_sensor',
+        namespace=namespace,
+        output='screen',
+        parameters=[{
+            'heat_field': heat_field,
+            'x_pose': x,
+            'y_pose': y,
+            'frame_id': spawn.scoped_frame(namespace, 'base_footprint'),
+            'use_sim_time': use_sim_time
+        }]
+    ) for namespace, x, y in robots]
 
 
 def generate_launch_description():
@@ -33,36 +158,47 @@ def generate_launch_description():
     use_sim_time = LaunchConfiguration('use_sim_time', default='true')
     x_pose = LaunchConfiguration('x_pose', default='0.0') #bot position at spawn
     y_pose = LaunchConfiguration('y_pose', default='0.0') #bot position at spawn
+    robots = LaunchConfiguration('robots', default='') #count or "[[x, y], ...]": several namespaced robots tb3_0, tb3_1, ...
+    headless = LaunchConfiguration('headless', default='false') #true: no gzclient, camera bridge or debug logging
+    timeline = LaunchConfiguration('timeline', default='false') #true: record and print the bringup timeline at shutdown
+    timeline_file = LaunchConfiguration('timeline_file', default='') #also write the timeline to this JSON file
+    heat_field = LaunchConfiguration('heat_field', default='') #<world>_heat.json from generate_heat_source.py --heat-field, enables the thermal sensor
+    record = LaunchConfiguration('record', default='') #directory to record odom/scan/imu/cmd_vel into (see episode_columns.py)
 
-    world = os.path.join(
+    world = LaunchConfiguration('world', default=os.path.join(
         get_package_share_directory('turtlebot3_gazebo'),
         'worlds',
         'maze_world.world' # location of world file, for maze use maze_world.world
-    )
+    )) # any world file, e.g. a cached maze from generate_maze.py
+    physics = LaunchConfiguration('physics', default='') #accurate / default / fast physics profile, overriding the world's own
     set_env_vars_resources = AppendEnvironmentVariable(
             'GZ_SIM_RESOURCE_PATH',
             os.path.join(get_package_share_directory('turtlebot3_gazebo'),
                          'models')) # robot model / environment and other variables to pass to gazebo
 
-    gzserver_cmd = IncludeLaunchDescription(
-        PythonLaunchDescriptionSource(
-            os.path.join(ros_gz_sim, 'launch', 'gz_sim.launch.py')
-        ),
-        launch_arguments={'gz_args': ['-r -s -v4 ', world], 'on_exit_shutdown': 'true'}.items()
-    ) # launch gazebo server with world file
+    gzserver_flags = PythonExpression([
+        "'-v2 --headless-rendering' if '", headless, "'.lower() == 'true' else '-v4'"
+    ]) # headless: warnings only, render sensors without a display
+
+    gzserver_cmd = OpaqueFunction(
+        function=start_gzserver,
+        args=[ros_gz_sim, world, physics, gzserver_flags]
+    )
     gzclient_cmd = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(
             os.path.join(ros_gz_sim, 'launch', 'gz_sim.launch.py')
         ),
-        launch_arguments={'gz_args': '-g -v4 '}.items()
+        launch_arguments={'gz_args': '-g -v4 '}.items(),
+        condition=UnlessCondition(headless)
     ) # launch gazebo client
 
     robot_state_publisher_cmd = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(
             os.path.join(launch_file_dir, 'robot_state_publisher.launch.py')
         ),
-        launch_arguments={'use_sim_time': use_sim_time}.items()
-    ) # launch robot state publisher
+        launch_arguments={'use_sim_time': use_sim_time}.items(),
+        condition=IfCondition(PythonExpression(["'", robots, "' == ''"]))
+    ) # launch robot state publisher (several robots get namespaced ones from spawn_turtlebot3.launch.py)
 
     spawn_turtlebot_cmd = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(
@@ -70,17 +206,49 @@ def generate_launch_description():
         ),
         launch_arguments={
             'x_pose': x_pose,
-            'y_pose': y_pose
+            'y_pose': y_pose,
+            'robots': robots,
+            'headless': headless
         }.items()
     )
 
+    thermal_sensor_cmd = OpaqueFunction(
+        function=start_thermal_sensors,
+        args=[launch_file_dir, heat_field, robots, x_pose, y_pose, use_sim_time],
+        condition=IfCondition(PythonExpression(["'", heat_field, "' != ''"]))
+    ) # simulated thermal sensor per robot reading the precomputed heat field
+
+    episode_recorder_cmd = Node(
+        package='turtlebot3_gazebo',
+        executable='episode_recorder.py',
+        name='episode_recorder',
+        output='screen',
+        parameters=[{
+            'output': record,
+            'use_sim_time': use_sim_time
+        }],
+        condition=IfCondition(PythonExpression(["'", record, "' != ''"]))
+    ) # columnar episode recording, loaded back with episode_columns.load_episode
+
+    startup_timeline = StartupTimeline(IfCondition(timeline))
+
     ld = LaunchDescription()
 
+    # Instrumentation first, so it sees every process start
+    for action in startup_timeline.actions(timeline_file):
+        ld.add_action(action)
+
     # Add the commands to the launch description
     ld.add_action(set_env_vars_resources)
+    ld.add_action(startup_timeline.marker('gzserver'))
     ld.add_action(gzserver_cmd)
+    ld.add_action(startup_timeline.marker('gzclient'))
     ld.add_action(gzclient_cmd)
+    ld.add_action(startup_timeline.marker('robot_state_publisher'))
     ld.add_action(robot_state_publisher_cmd)
+    ld.add_action(startup_timeline.marker('spawn_turtlebot3'))
     ld.add_action(spawn_turtlebot_cmd)
+    ld.add_action(thermal_sensor_cmd)
+    ld.add_action(episode_recorder_cmd)
 
     return ld
\ No newline at end of file
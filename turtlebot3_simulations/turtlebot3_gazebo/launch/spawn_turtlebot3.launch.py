@@ -13,12 +13,295 @@
 # limitations under the License.
 
 import os
+import tempfile
+import xml.etree.ElementTree as ET
 
 from ament_index_python.packages import get_package_share_directory
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument
+from launch.actions import OpaqueFunction
+from launch.actions import RegisterEventHandler
+from launch.event_handlers import OnShutdown
 from launch.substitutions import LaunchConfiguration
 from launch_ros.actions import Node
+import yaml
+
+
+def remove_on_shutdown(path):
+    # Temporary files written for this launch are deleted when it shuts down
+    def remove(event, context):
+        if os.path.exists(path):
+            os.remove(path)
+    return RegisterEventHandler(OnShutdown(on_shutdown=remove))
+
+
+def bridge_catalogue(model):
+    # Bridge config listing every topic the model can bridge; models without their own use burger's
+    params_dir = os.path.join(get_package_share_directory('turtlebot3_gazebo'), 'params')
+    config = os.path.join(params_dir, f'turtlebot3_{model}_bridge.yaml')
+    if not os.path.exists(config):
+        config = os.path.join(params_dir, 'turtlebot3_burger_bridge.yaml')
+    return config
+
+
+# Topics every robot shares instead of getting its own namespaced copy
+SHARED_TOPICS = ('clock',)
+
+ROBOT_SPACING = 0.5  # Distance between robots spawned by count [m], one maze cell
+
+
+def robot_namespaces(robots, x_pose, y_pose):
+    # robots:=N spawns N robots in a row along x from (x_pose, y_pose),
+    # robots:="[[x, y], ...]" one robot at each pose; robots tb3_0, tb3_1, ... are namespaced by name.
+    # Returns [(namespace, x, y)]; without robots, the single unnamespaced robot at (x_pose, y_pose)
+    robots = yaml.safe_load(robots) if robots.strip() else None
+    if robots is None:
+        return [('', float(x_pose), float(y_pose))]
+    if isinstance(robots, int) and not isinstance(robots, bool):
+        poses = [(float(x_pose) + index * ROBOT_SPACING, float(y_pose)) for index in range(robots)]
+    elif isinstance(robots, list) and all(isinstance(pose, list) and len(pose) == 2 for pose in robots):
+        poses = [(float(x), float(y)) for x, y in robots]
+    else:
+        raise RuntimeError(f'robots must be a count or a list of [x, y] poses, not {robots!r}')
+    if not poses:
+        raise RuntimeError('robots must spawn at least one robot')
+    return [(f'tb3_{index}', x, y) for index, (x, y) in enumerate(poses)]
+
+
+# Camera images are not in the bridge catalogues: they go through LAZY_IMAGE_ENTRY with
+# camera_on_demand, and through the ros_gz_image bridge otherwise
+IMAGE_TOPIC = 'camera/image_raw'
+
+# Camera images through the parameter bridge, lazily: nothing is subscribed on the gz side
+# (so gz does not even render the camera) until a ROS subscriber appears.
+# camera_info has to be lazy as well, or its subscription alone keeps the camera rendering.
+LAZY_IMAGE_ENTRY = {
+    'ros_topic_name': IMAGE_TOPIC,
+    'gz_topic_name': IMAGE_TOPIC,
+    'ros_type_name': 'sensor_msgs/msg/Image',
+    'gz_type_name': 'gz.msgs.Image',
+    'direction': 'GZ_TO_ROS',
+    'lazy': True,
+}
+
+
+def scoped_topic(namespace, topic):
+    topic = topic.lstrip('/')
+    return f'{namespace}/{topic}' if namespace and topic not in SHARED_TOPICS else topic
+
+
+def scoped_frame(namespace, frame):
+    frame = frame.lstrip('/')
+    return f'{namespace}/{frame}' if namespace else frame
+
+
+def bridge_config(base_config, topics='all', qos=None, exclude_prefixes=(), extra_entries=(),
+                  lazy_prefixes=(), namespaces=('',)):
+    # Write a bridge config holding only the requested topics of base_config plus extra_entries
+    # (comma separated ROS topic names, or 'all'), minus those starting with any of exclude_prefixes.
+    # Topics starting with any of lazy_prefixes are only bridged while something subscribes.
+    # IMAGE_TOPIC may always be requested: without an entry for it, the image bridge carries it.
+    # qos maps topic -> {depth, lazy, reliability, durability, history}: depth and lazy go into
+    # the bridge entry, the others become qos_overrides parameters of the bridge node.
+    # Every entry is repeated under each of namespaces, except the SHARED_TOPICS.
+    # Returns (config path, parameters).
+    with open(base_config) as file:
+        entries = yaml.safe_load(file) + [dict(entry) for entry in extra_entries]
+    available = [entry['ros_topic_name'].lstrip('/') for entry in entries]
+    if topics.strip() != 'all':
+        requested = [topic.strip().lstrip('/') for topic in topics.split(',') if topic.strip()]
+        unknown = sorted(set(requested) - set(available) - {IMAGE_TOPIC})
+        if unknown:
+            raise RuntimeError(
+                f'Cannot bridge {unknown}: {os.path.basename(base_config)} has {available}')
+        entries = [entry for entry, name in zip(entries, available) if name in requested]
+    entries = [
+        entry for entry in entries
+        if not entry['ros_topic_name'].lstrip('/').startswith(exclude_prefixes)
+    ]
+    for entry in entries:
+        if entry['ros_topic_name'].lstrip('/').startswith(lazy_prefixes):
+            entry['lazy'] = True
+
+    overrides = []
+    for topic, settings in (qos or {}).items():
+        topic = topic.lstrip('/')
+        entry = next(
+            (entry for entry in entries if entry['ros_topic_name'].lstrip('/') == topic), None)
+        if entry is None:
+            raise RuntimeError(f'QoS given for {topic}, which is not bridged')
+        for key, value in settings.items():
+            if key == 'depth':
+                entry['publisher_queue'] = entry['subscriber_queue'] = int(value)
+            elif key == 'lazy':
+                entry['lazy'] = bool(value)
+            elif key in ('reliability', 'durability', 'history'):
+                endpoint = 'publisher' if entry['direction'] == 'GZ_TO_ROS' else 'subscription'
+                overrides.append((topic, f'{endpoint}.{key}', str(value)))
+            else:
+                raise RuntimeError(f'Unknown QoS setting {key} for {topic}')
+
+    entries = [
+        dict(entry,
+             ros_topic_name=scoped_topic(namespace, entry['ros_topic_name']),
+             gz_topic_name=scoped_topic(namespace, entry['gz_topic_name']))
+        for index, namespace in enumerate(namespaces) for entry in entries
+        if index == 0 or entry['ros_topic_name'].lstrip('/') not in SHARED_TOPICS
+    ]
+    parameters = {
+        f'qos_overrides./{scoped_topic(namespace, topic)}.{setting}': value
+        for namespace in namespaces for topic, setting, value in overrides
+    }
+
+    config = tempfile.NamedTemporaryFile(
+        'w', prefix='turtlebot3_bridge_', suffix='.yaml', delete=False)
+    with config:
+        yaml.safe_dump(entries, config, sort_keys=False)
+    return config.name, parameters
+
+
+def start_bridge(context, model):
+    # One bridge for every robot. Headless runs have no camera consumers: leave camera topics out
+    namespaces = [namespace for namespace, _, _ in robot_namespaces(
+        LaunchConfiguration('robots').perform(context),
+        LaunchConfiguration('x_pose').perform(context),
+        LaunchConfiguration('y_pose').perform(context))]
+    headless = LaunchConfiguration('headless').perform(context).lower() == 'true'
+    on_demand = LaunchConfiguration('camera_on_demand').perform(context).lower() == 'true'
+    topics = LaunchConfiguration('bridge_topics').perform(context)
+    config, parameters = bridge_config(
+        bridge_catalogue(model),
+        topics,
+        yaml.safe_load(LaunchConfiguration('bridge_qos').perform(context)) or {},
+        ('camera',) if headless else (),
+        (LAZY_IMAGE_ENTRY,) if on_demand else (),
+        ('camera',) if on_demand else (),
+        namespaces)
+    bridges = [Node(
+        package='ros_gz_bridge',
+        executable='parameter_bridge',
+        parameters=[{'config_file': config, **parameters}],
+        output='screen',
+    ), remove_on_shutdown(config)]
+
+    # Without on-demand images, camera images go through ros_gz_image, converting every frame
+    requested = [topic.strip().lstrip('/') for topic in topics.split(',')]
+    if not headless and not on_demand and (topics.strip() == 'all' or IMAGE_TOPIC in requested):
+        bridges.append(Node(
+            package='ros_gz_image',
+            executable='image_bridge',
+            arguments=[f'/{scoped_topic(namespace, IMAGE_TOPIC)}' for namespace in namespaces],
+            output='screen',
+        ))
+    return bridges
+
+
+# Model SDF elements naming a gz topic, moved under the robot's namespace
+TOPIC_ELEMENTS = ('topic', 'odom_topic', 'tf_topic', 'camera_info_topic')
+# Model SDF elements naming a tf frame (gz systems and the classic ROS plugins), prefixed with it
+FRAME_ELEMENTS = ('frame_id', 'child_frame_id', 'gz_frame_id',
+                  'frame_name', 'odometry_frame', 'robot_base_frame')
+
+
+def model_with_sensor_overrides(model_path, sensor_rates, camera_max_rate=None, camera_downscale=1,
+                                namespace=''):
+    # Copy of a model SDF where each sensor publishing on a topic in sensor_rates
+    # (topic -> Hz) updates at that rate instead, e.g. {imu: 50} instead of the 200 Hz IMU,
+    # and camera sensors (if any) update at most camera_max_rate Hz and render images
+    # camera_downscale times smaller in each dimension.
+    # With a namespace, every gz topic of the model (sensors, odom, tf, cmd_vel, joint_states)
+    # moves under it and every frame it publishes (odom, base_footprint, base_scan, ...) is
+    # prefixed with it, so several copies of the model can share one world and one tf tree
+    tree = ET.parse(model_path)
+    remaining = {topic.lstrip('/'): rate for topic, rate in sensor_rates.items()}
+
+    def set_update_rate(sensor, rate):
+        update_rate = sensor.find('update_rate')
+        if update_rate is None:
+            update_rate = ET.SubElement(sensor, 'update_rate')
+        update_rate.text = str(rate)
+
+    for sensor in tree.getroot().iter('sensor'):
+        topic = (sensor.findtext('topic') or '').strip().lstrip('/')
+        if topic in remaining:
+            set_update_rate(sensor, remaining.pop(topic))
+        if sensor.get('type') != 'camera':
+            continue
+        rate = sensor.findtext('update_rate')
+        if camera_max_rate and (not rate or float(rate) > camera_max_rate):
+            set_update_rate(sensor, camera_max_rate)
+        for size in ('camera/image/width', 'camera/image/height'):
+            element = sensor.find(size)
+            if element is not None:
+                element.text = str(max(1, int(element.text) // camera_downscale))
+    if remaining:
+        raise RuntimeError(f'No sensor publishes {sorted(remaining)} in {model_path}')
+    if namespace:
+        for tag in TOPIC_ELEMENTS:
+            for element in tree.getroot().iter(tag):
+                element.text = scoped_topic(namespace, element.text.strip())
+        for tag in FRAME_ELEMENTS:
+            for element in tree.getroot().iter(tag):
+                element.text = scoped_frame(namespace, element.text.strip())
+    model = tempfile.NamedTemporaryFile(
+        'wb', prefix='turtlebot3_model_', suffix='.sdf', delete=False)
+    with model:
+        tree.write(model, xml_declaration=True)
+    return model.name
+
+
+def robot_state_publisher(model, namespace):
+    # Namespaced robot_state_publisher for one of several robots, its frames prefixed like the
+    # model's (see model_with_sensor_overrides); the single unnamespaced robot gets its
+    # robot_state_publisher from robot_state_publisher.launch.py instead
+    urdf_path = os.path.join(
+        get_package_share_directory('turtlebot3_gazebo'), 'urdf', f'turtlebot3_{model}.urdf')
+    with open(urdf_path, 'r') as infp:
+        robot_desc = infp.read()
+    return Node(
+        package='robot_state_publisher',
+        executable='robot_state_publisher',
+        name='robot_state_publisher',
+        namespace=namespace,
+        output='screen',
+        parameters=[{
+            'use_sim_time': True,
+            'robot_description': robot_desc,
+            'frame_prefix': scoped_frame(namespace, ''),
+        }],
+        remappings=[('/tf', 'tf'), ('/tf_static', 'tf_static')],
+    )
+
+
+def spawn_robot(context, model, urdf_path, x_pose, y_pose):
+    sensor_rates = yaml.safe_load(LaunchConfiguration('sensor_rates').perform(context)) or {}
+    camera_max_rate = float(LaunchConfiguration('camera_max_rate').perform(context) or 0)
+    camera_downscale = int(LaunchConfiguration('camera_downscale').perform(context) or 1)
+    robots = robot_namespaces(
+        LaunchConfiguration('robots').perform(context), x_pose.perform(context), y_pose.perform(context))
+
+    actions = []
+    for namespace, x, y in robots:
+        model_path = urdf_path
+        if namespace or sensor_rates or camera_max_rate or camera_downscale > 1:
+            model_path = model_with_sensor_overrides(
+                urdf_path, sensor_rates, camera_max_rate, camera_downscale, namespace)
+            actions.append(remove_on_shutdown(model_path))
+        actions.append(Node(
+            package='ros_gz_sim',
+            executable='create',
+            arguments=[
+                '-name', namespace or model,
+                '-file', model_path,
+                '-x', str(x),
+                '-y', str(y),
+                '-z', '0.01'
+            ],
+            output='screen',
+        ))
+        if namespace:
+            actions.append(robot_state_publisher(model, namespace))
+    return actions
 
 
 def generate_launch_description():
@@ -45,52 +328,63 @@ def generate_launch_description():
         'y_pose', default_value='0.0',
         description='Specify namespace of the robot')
 
-    start_gazebo_ros_spawner_cmd = Node(
-        package='ros_gz_sim',
-        executable='create',
-        arguments=[
-            '-name', TURTLEBOT3_MODEL,
-            '-file', urdf_path,
-            '-x', x_pose,
-            '-y', y_pose,
-            '-z', '0.01'
-        ],
-        output='screen',
-    )
+    declare_headless_cmd = DeclareLaunchArgument(
+        'headless', default_value='false',
+        description='Skip the camera image bridge and camera topics')
 
-    bridge_params = os.path.join(
-        get_package_share_directory('turtlebot3_gazebo'),
-        'params',
-        'turtlebot3_burger_bridge.yaml'
-    )
+    declare_bridge_topics_cmd = DeclareLaunchArgument(
+        'bridge_topics', default_value='all',
+        description='Comma separated ROS topics to bridge (e.g. clock,odom,tf,cmd_vel,scan), '
+                    'or all; camera/image_raw selects the image bridge')
 
-    start_gazebo_ros_bridge_cmd = Node(
-        package='ros_gz_bridge',
-        executable='parameter_bridge',
-        arguments=[
-            '--ros-args',
-            '-p',
-            f'config_file:={bridge_params}',
-        ],
-        output='screen',
-    )
+    declare_bridge_qos_cmd = DeclareLaunchArgument(
+        'bridge_qos', default_value='{}',
+        description='Per-topic bridge QoS as YAML, '
+                    'e.g. {scan: {depth: 5, reliability: best_effort}, imu: {lazy: true}}')
 
-    start_gazebo_ros_image_bridge_cmd = Node(
-        package='ros_gz_image',
-        executable='image_bridge',
-        arguments=['/camera/image_raw'],
-        output='screen',
-    )
+    declare_sensor_rates_cmd = DeclareLaunchArgument(
+        'sensor_rates', default_value='{}',
+        description='Sensor update rates in Hz by topic as YAML, e.g. {imu: 50}')
+
+    declare_camera_on_demand_cmd = DeclareLaunchArgument(
+        'camera_on_demand', default_value='true',
+        description='Bridge camera images lazily, only while something subscribes; '
+                    'false runs the ros_gz_image bridge on every frame')
+
+    declare_camera_max_rate_cmd = DeclareLaunchArgument(
+        'camera_max_rate', default_value='',
+        description='Maximum camera frame rate in Hz (default: the model\'s rate)')
+
+    declare_camera_downscale_cmd = DeclareLaunchArgument(
+        'camera_downscale', default_value='1',
+        description='Render camera images this many times smaller in each dimension')
+
+    declare_robots_cmd = DeclareLaunchArgument(
+        'robots', default_value='',
+        description='Spawn several robots tb3_0, tb3_1, ... each in its own namespace: a count '
+                    '(in a row along x from x_pose, y_pose) or a list of poses, e.g. "[[0, 0], [1, 0]]"')
+
+    start_gazebo_ros_spawner_cmd = OpaqueFunction(
+        function=spawn_robot, args=[TURTLEBOT3_MODEL, urdf_path, x_pose, y_pose])
+
+    start_gazebo_ros_bridge_cmd = OpaqueFunction(function=start_bridge, args=[TURTLEBOT3_MODEL])
 
     ld = LaunchDescription()
 
     # Declare the launch options
     ld.add_action(declare_x_position_cmd)
     ld.add_action(declare_y_position_cmd)
+    ld.add_action(declare_headless_cmd)
+    ld.add_action(declare_bridge_topics_cmd)
+    ld.add_action(declare_bridge_qos_cmd)
+    ld.add_action(declare_sensor_rates_cmd)
+    ld.add_action(declare_camera_on_demand_cmd)
+    ld.add_action(declare_camera_max_rate_cmd)
+    ld.add_action(declare_camera_downscale_cmd)
+    ld.add_action(declare_robots_cmd)
 
     # Add any conditioned actions
     ld.add_action(start_gazebo_ros_spawner_cmd)
     ld.add_action(start_gazebo_ros_bridge_cmd)
-    ld.add_action(start_gazebo_ros_image_bridge_cmd)
 
     return ld
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import rclpy
+from ament_index_python.packages import get_package_share_directory
+from geometry_msgs.msg import Twist
+from nav_msgs.msg import Odometry
+from rclpy.node import Node
+from rclpy.qos import qos_profile_sensor_data
+from sensor_msgs.msg import Imu, LaserScan
+
+sys.path.append(os.path.join(get_package_share_directory("turtlebot3_gazebo"), "worlds"))
+from episode_columns import CHUNK_ROWS, StreamWriter, write_episode_metadata  # noqa: E402
+
+# ==========================
+# Recorder Parameters
+# ==========================
+STREAMS = ["odom", "scan", "imu", "cmd_vel"]  # Topics recorded by default
+
+def stamp_ns(stamp):
+    return stamp.sec * 1_000_000_000 + stamp.nanosec
+
+# ==========================
+# Episode recorder node
+# ==========================
+class EpisodeRecorder(Node):
+    """
+    Record odom, scan, imu and cmd_vel into columnar files under `output` (see episode_columns.py):
+    one memory-mappable .npy per field plus each stream's stamp.npy timestamp index, so an episode
+    loads back into NumPy with load_episode() without deserializing a single message.
+    Messages are stamped with their header stamp; cmd_vel (a plain Twist) with the time it arrived.
+    The scan stream is opened on the first LaserScan, with as many ranges per row as it has;
+    later scans of another width are dropped with a warning.
+    episode.json is rewritten whenever a stream is opened, so a killed recording stays loadable.
+    """
+    def __init__(self):
+        super().__init__("episode_recorder")
+        self.declare_parameter("output", time.strftime("episode_%Y%m%d_%H%M%S"))
+        self.declare_parameter("streams", STREAMS)
+        self.declare_parameter("chunk_rows", CHUNK_ROWS)
+
+        self.output = os.path.abspath(self.get_parameter("output").value)
+        self.chunk_rows = self.get_parameter("chunk_rows").value
+        requested = self.get_parameter("streams").value
+        unknown = sorted(set(requested) - set(STREAMS))
+        if unknown:
+            raise RuntimeError(f"Cannot record {unknown}: only {STREAMS}")
+
+        fields = {
+            "odom": {"x": ("float64", ()), "y": ("float64", ()), "yaw": ("float32", ()),
+                     "linear": ("float32", ()), "angular": ("float32", ())},
+            "imu": {"orientation": ("float32", (4,)), "angular_velocity": ("float32", (3,)),
+                    "linear_acceleration": ("float32", (3,))},
+            "cmd_vel": {"linear": ("float32", ()), "angular": ("float32", ())},
+        }
+        self.streams = {name: StreamWriter(os.path.join(self.output, name), fields[name], self.chunk_rows)
+                        for name in requested if name != "scan"}
+        self.scan_metadata = {}
+        self.write_metadata()
+        self.messages = 0
+        self.dropped = {}
+        self.busy_time = 0.0
+
+        callbacks = {"odom": (Odometry, self.odom_callback), "scan": (LaserScan, self.scan_callback),
+                     "imu": (Imu, self.imu_callback), "cmd_vel": (Twist, self.cmd_vel_callback)}
+        for name in requested:
+            message_type, callback = callbacks[name]
+            qos = 10 if name == "cmd_vel" else qos_profile_sensor_data
+            self.create_subscription(message_type, name, callback, qos)
+        self.get_logger().info(f"Recording {', '.join(requested)} to {self.output}")
+
+    def odom_callback(self, msg):
+        pose = msg.pose.pose
+        q = pose.orientation
+        yaw = math.atan2(2.0 * (q.w * q.z + q.x * q.y), 1.0 - 2.0 * (q.y * q.y + q.z * q.z))
+        self.record("odom", stamp_ns(msg.header.stamp), x=pose.position.x, y=pose.position.y, yaw=yaw,
+                    linear=msg.twist.twist.linear.x, angular=msg.twist.twist.angular.z)
+
+    def scan_callback(self, msg):
+        if "scan" not in self.streams:
+            self.streams["scan"] = StreamWriter(os.path.join(self.output, "scan"),
+                                                {"ranges": ("float32", (len(msg.ranges),))}, self.chunk_rows)
+            self.scan_metadata = {"frame_id": msg.header.frame_id, "angle_min": msg.angle_min,
+                                  "angle_increment": msg.angle_increment, "range_min": msg.range_min,
+                                  "range_max": msg.range_max}
+            self.write_metadata()
+        # ranges is an array.array of float32: viewed, not converted
+        self.record("scan", stamp_ns(msg.header.stamp), ranges=np.frombuffer(msg.ranges, dtype=np.float32))
+
+    def imu_callback(self, msg):
+        q, w, a = msg.orientation, msg.angular_velocity, msg.linear_acceleration
+        self.record("imu", stamp_ns(msg.header.stamp), orientation=(q.x, q.y, q.z, q.w),
+                    angular_velocity=(w.x, w.y, w.z), linear_acceleration=(a.x, a.y, a.z))
+
+    def cmd_vel_callback(self, msg):
+        self.record("cmd_vel", self.get_clock().now().nanoseconds, linear=msg.linear.x, angular=msg.angular.z)
+
+    def record(self, name, stamp, **values):
+        start = time.perf_counter()
+        try:
+            self.streams[name].append(stamp, **values)
+        except ValueError as error:
+            self.dropped[name] = self.dropped.get(name, 0) + 1
+            self.get_logger().warning(f"Dropped {name} message: {error}", throttle_duration_sec=5.0)
+            return
+        self.messages += 1
+        self.busy_time += time.perf_counter() - start
+
+    def write_metadata(self):
+        write_episode_metadata(self.output, self.streams, {"scan": self.scan_metadata} if self.scan_metadata else {})
+
+    def close(self):
+        for stream in self.streams.values():
+            stream.close()
+        self.write_metadata()
+        summary = ", ".join(f"{name} {stream.rows}" for name, stream in self.streams.items())
+        size = sum(stream.nbytes() for stream in self.streams.values())
+        self.get_logger().info(f"Recorded {summary} messages ({size / 1e6:.1f} MB) to {self.output}")
+        if self.messages:
+            self.get_logger().info(f"{self.busy_time / self.messages * 1e6:.1f} us per message")
+        dropped = ", ".join(f"{name} {count}" for name, count in self.dropped.items() if count)
+        if dropped:
+            self.get_logger().warning(f"Dropped {dropped} malformed messages")
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = EpisodeRecorder()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.close()
+        node.destroy_node()
+        if rclpy.ok():
+            rclpy.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import array
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import rclpy
+from ament_index_python.packages import get_package_share_directory
+from nav_msgs.msg import Odometry
+from rcl_interfaces.msg import ParameterDescriptor
+from rclpy.node import Node
+from rclpy.qos import qos_profile_sensor_data
+from sensor_msgs.msg import LaserScan
+
+sys.path.append(os.path.join(get_package_share_directory("turtlebot3_gazebo"), "worlds"))
+from lidar_raycast import WallRaycaster, lidar_spec, scan_angles  # noqa: E402
+from world_geometry import compose_pose  # noqa: E402
+
+# ==========================
+# Fake Lidar Parameters
+# ==========================
+FRAME_ID = "base_scan"  # Frame the scans are stamped with
+
+# ==========================
+# Fake lidar node
+# ==========================
+class FakeLidar(Node):
+    """
+    Lidar for turtlebot3_fake_node: tracks the robot pose from `odom` and publishes the scan the
+    model's lidar (hls_lfcd_lds: samples, angles, ranges, rate and noise read from its model.sdf)
+    would see of the walls of `world` on `scan`. The odometry frame starts at the spawn pose, so
+    x_pose/y_pose/yaw_pose shift it into world coordinates.
+    """
+    def __init__(self):
+        super().__init__("fake_lidar")
+        any_type = ParameterDescriptor(dynamic_typing=True)
+        self.declare_parameter("world", "")
+        self.declare_parameter("model", os.environ.get("TURTLEBOT3_MODEL", "burger"))
+        self.declare_parameter("publish_rate", 0.0, any_type)
+        self.declare_parameter("noise", True)
+        self.declare_parameter("x_pose", 0.0, any_type)
+        self.declare_parameter("y_pose", 0.0, any_type)
+        self.declare_parameter("yaw_pose", 0.0, any_type)
+        self.declare_parameter("frame_id", FRAME_ID)
+
+        world = self.get_parameter("world").value
+        if not world:
+            raise RuntimeError("Set the world parameter to the .world file of the maze")
+        model = self.get_parameter("model").value
+        self.spec = lidar_spec(os.path.join(
+            get_package_share_directory("turtlebot3_gazebo"), "models", f"turtlebot3_{model}", "model.sdf"))
+        self.raycaster = WallRaycaster.from_world(world, self.spec["range_max"])
+        self.angles = scan_angles(self.spec)
+        self.noise = self.spec["noise"] if self.get_parameter("noise").value else 0.0
+        self.rng = np.random.default_rng()
+        self.spawn = (float(self.get_parameter("x_pose").value), float(self.get_parameter("y_pose").value),
+                      float(self.get_parameter("yaw_pose").value))
+        self.pose = None
+
+        # One message, refilled for every scan
+        publish_rate = float(self.get_parameter("publish_rate").value) or self.spec["update_rate"]
+        self.scan = LaserScan()
+        self.scan.header.frame_id = self.get_parameter("frame_id").value
+        self.scan.angle_min = self.spec["min_angle"]
+        self.scan.angle_max = self.spec["max_angle"]
+        self.scan.angle_increment = self.spec["angle_increment"]
+        self.scan.scan_time = 1.0 / publish_rate
+        self.scan.range_min = self.spec["range_min"]
+        self.scan.range_max = self.spec["range_max"]
+        self.scans = 0
+        self.busy_time = 0.0
+
+        self.publisher = self.create_publisher(LaserScan, "scan", 10)
+        self.create_subscription(Odometry, "odom", self.odom_callback, qos_profile_sensor_data)
+        self.create_timer(1.0 / publish_rate, self.publish_scan)
+        self.get_logger().info(
+            f"Fake {model} lidar in {world} ({len(self.raycaster.x_min)} walls, "
+            f"{self.spec['samples']} samples at {publish_rate:g} Hz)")
+
+    def odom_callback(self, msg):
+        position = msg.pose.pose.position
+        orientation = msg.pose.pose.orientation
+        yaw = math.atan2(2.0 * (orientation.w * orientation.z + orientation.x * orientation.y),
+                         1.0 - 2.0 * (orientation.y * orientation.y + orientation.z * orientation.z))
+        self.pose = (position.x, position.y, yaw)
+
+    def publish_scan(self):
+        if self.pose is None:
+            return
+        start = time.perf_counter()
+        # Spawn pose, then the odometry pose, then where the lidar sits on the robot
+        x, y, yaw = compose_pose(compose_pose(self.spawn, self.pose), self.spec["pose"])
+        ranges = self.raycaster.cast(x, y, self.angles + yaw)
+        if self.noise:
+            ranges += self.rng.normal(0.0, self.noise, len(ranges))
+        self.scan.header.stamp = self.get_clock().now().to_msg()
+        self.scan.ranges = array.array("f", ranges.astype(np.float32).tobytes())
+        self.publisher.publish(self.scan)
+        self.scans += 1
+        self.busy_time += time.perf_counter() - start
+
+    def report(self):
+        if self.scans:
+            self.get_logger().info(f"{self.scans} scans, {self.busy_time / self.scans * 1e6:.1f} us per scan")
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = FakeLidar()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.report()
+        node.destroy_node()
+        if rclpy.ok():
+            rclpy.shutdown()
+
+if __name__ == "__main__":
+    main()
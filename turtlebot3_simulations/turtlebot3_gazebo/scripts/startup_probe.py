@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import time
+
+import rclpy
+from rclpy.node import Node
+from rclpy.qos import qos_profile_sensor_data
+from rosidl_runtime_py.utilities import get_message
+
+# ==========================
+# Startup Probe Parameters
+# ==========================
+TOPICS = ["clock", "odom", "scan"]  # Topics whose first message marks a bringup milestone
+DISCOVERY_PERIOD = 0.05             # Seconds between checks for newly advertised topics
+
+# ==========================
+# Startup probe node
+# ==========================
+class StartupProbe(Node):
+    """
+    Wait for the first message on each topic and print `first_message <topic> <wall time>` to stdout
+    for the launch timeline (maze_world.launch.py timeline:=true), then exit once all have been seen.
+    Topic types are discovered from the graph and messages are taken raw, never deserialized.
+    """
+    def __init__(self):
+        super().__init__("startup_probe")
+        self.declare_parameter("topics", TOPICS)
+        self.pending = {self.resolve_topic_name(topic) for topic in self.get_parameter("topics").value}
+        self.probes = {}
+        self.create_timer(DISCOVERY_PERIOD, self.discover)
+
+    def discover(self):
+        for topic, types in self.get_topic_names_and_types():
+            if topic in self.pending and topic not in self.probes:
+                self.probes[topic] = self.create_subscription(
+                    get_message(types[0]), topic, lambda msg, topic=topic: self.first_message(topic),
+                    qos_profile_sensor_data, raw=True)
+
+    def first_message(self, topic):
+        if topic in self.pending:
+            self.pending.discard(topic)
+            print(f"first_message {topic} {time.time():.6f}", flush=True)
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = StartupProbe()
+    try:
+        while rclpy.ok() and node.pending:
+            rclpy.spin_once(node, timeout_sec=0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.destroy_node()
+        if rclpy.ok():
+            rclpy.shutdown()
+
+if __name__ == "__main__":
+    main()
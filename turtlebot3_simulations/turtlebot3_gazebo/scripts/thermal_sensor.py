@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import json
+import math
+import os
+import time
+
+import numpy as np
+import rclpy
+from nav_msgs.msg import Odometry
+from rcl_interfaces.msg import ParameterDescriptor
+from rclpy.node import Node
+from rclpy.qos import qos_profile_sensor_data
+from sensor_msgs.msg import Temperature
+
+# ==========================
+# Thermal Sensor Parameters
+# ==========================
+PUBLISH_RATE = 100.0    # Readings per second [Hz]
+FRAME_ID = "base_footprint"  # Frame the readings are stamped with
+
+# ==========================
+# Heat field lookups
+# ==========================
+class HeatField:
+    """
+    Heat field written by generate_heat_source.py --heat-field (<world>_heat.json + <world>_heat.npy).
+    The grid is memory-mapped, so only the pages around the robot are ever read from disk.
+    """
+    def __init__(self, metadata_path):
+        with open(metadata_path) as file:
+            metadata = json.load(file)
+        field_path = os.path.join(os.path.dirname(os.path.abspath(metadata_path)), metadata["field"])
+        # Plain ndarray view of the memmap: same pages, cheaper scalar access
+        self.field = np.asarray(np.load(field_path, mmap_mode="r"))
+        self.origin_x, self.origin_y = metadata["origin"]
+        self.resolution = metadata["resolution"]
+        self.rows, self.cols = self.field.shape
+
+    def sample(self, x, y):
+        """
+        Bilinearly interpolate the heat at world (x, y) between the four surrounding cell centers.
+        Points within half a cell of the border use the border cells; points beyond it read 0.
+        """
+        # Cell (row, col) is centered at origin + (index + 0.5) * resolution
+        u = (x - self.origin_x) / self.resolution - 0.5
+        v = (y - self.origin_y) / self.resolution - 0.5
+        if not (-0.5 <= u <= self.cols - 0.5 and -0.5 <= v <= self.rows - 0.5):
+            return 0.0
+        col = math.floor(u)
+        row = math.floor(v)
+        fx = u - col
+        fy = v - row
+        col0, col1 = max(col, 0), min(col + 1, self.cols - 1)
+        row0, row1 = max(row, 0), min(row + 1, self.rows - 1)
+        item = self.field.item
+        bottom = item(row0, col0) * (1.0 - fx) + item(row0, col1) * fx
+        top = item(row1, col0) * (1.0 - fx) + item(row1, col1) * fx
+        return bottom * (1.0 - fy) + top * fy
+
+# ==========================
+# Thermal sensor node
+# ==========================
+class ThermalSensor(Node):
+    """
+    Simulated thermal sensor: tracks the robot pose from `odom` and publishes the heat intensity
+    at that pose on `thermal_sensor` (sensor_msgs/Temperature, relative intensity units, not degrees)
+    at publish_rate. The odometry frame starts at the spawn pose, so x_pose/y_pose (the same
+    values the robot was spawned with) shift it into world coordinates.
+    """
+    def __init__(self):
+        super().__init__("thermal_sensor")
+        any_type = ParameterDescriptor(dynamic_typing=True)
+        self.declare_parameter("heat_field", "")
+        self.declare_parameter("publish_rate", PUBLISH_RATE, any_type)
+        self.declare_parameter("x_pose", 0.0, any_type)
+        self.declare_parameter("y_pose", 0.0, any_type)
+        self.declare_parameter("frame_id", FRAME_ID)
+
+        heat_field = self.get_parameter("heat_field").value
+        if not heat_field:
+            raise RuntimeError("Set the heat_field parameter to a <world>_heat.json file")
+        self.field = HeatField(heat_field)
+        self.x_offset = float(self.get_parameter("x_pose").value)
+        self.y_offset = float(self.get_parameter("y_pose").value)
+        self.x = None
+        self.y = None
+
+        # One message, refilled for every reading
+        self.reading = Temperature()
+        self.reading.header.frame_id = self.get_parameter("frame_id").value
+        self.readings = 0
+        self.busy_time = 0.0
+
+        self.publisher = self.create_publisher(Temperature, "thermal_sensor", 10)
+        self.create_subscription(Odometry, "odom", self.odom_callback, qos_profile_sensor_data)
+        self.create_timer(1.0 / float(self.get_parameter("publish_rate").value), self.publish_reading)
+        self.get_logger().info(
+            f"Thermal sensor on {heat_field} ({self.field.cols}x{self.field.rows} cells, "
+            f"{self.field.resolution} m)")
+
+    def odom_callback(self, msg):
+        position = msg.pose.pose.position
+        self.x = position.x + self.x_offset
+        self.y = position.y + self.y_offset
+
+    def publish_reading(self):
+        if self.x is None:
+            return
+        start = time.perf_counter()
+        self.reading.header.stamp = self.get_clock().now().to_msg()
+        self.reading.temperature = self.field.sample(self.x, self.y)
+        self.publisher.publish(self.reading)
+        self.readings += 1
+        self.busy_time += time.perf_counter() - start
+
+    def report(self):
+        if self.readings:
+            self.get_logger().info(
+                f"{self.readings} readings, {self.busy_time / self.readings * 1e6:.1f} us per reading")
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = ThermalSensor()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.report()
+        node.destroy_node()
+        if rclpy.ok():
+            rclpy.shutdown()
+
+if __name__ == "__main__":
+    main()
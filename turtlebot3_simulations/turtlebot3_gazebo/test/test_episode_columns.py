@@ -0,0 +1,24 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "worlds"))
+from episode_columns import StreamWriter  # noqa: E402
+
+
+def test_rejected_row_leaves_columns_aligned(tmp_path):
+    stream = StreamWriter(str(tmp_path / "scan"), {"ranges": ("float32", (360,)), "intensity": ("float32", ())},
+                          chunk_rows=4)
+    stream.append(1, ranges=np.ones(360, dtype=np.float32), intensity=0.5)
+    with pytest.raises(ValueError):
+        stream.append(2, ranges=np.ones(359, dtype=np.float32), intensity=0.5)
+    with pytest.raises(ValueError):
+        stream.append(3, ranges=np.ones(360, dtype=np.float32))
+    stream.append(4, ranges=np.zeros(360, dtype=np.float32), intensity=1.0)
+    stream.close()
+
+    assert np.load(tmp_path / "scan" / "stamp.npy").tolist() == [1, 4]
+    assert np.load(tmp_path / "scan" / "ranges.npy").shape == (2, 360)
+    assert np.load(tmp_path / "scan" / "intensity.npy").tolist() == [0.5, 1.0]
@@ -0,0 +1,61 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "worlds"))
+from lint_world import lint_world  # noqa: E402
+
+
+def box_model(name, x, y, z, size_x, size_y, size_z):
+    return f"""    <model name="{name}">
+      <static>true</static>
+      <pose>{x} {y} {z} 0 0 0</pose>
+      <link name="link">
+        <collision name="collision">
+          <geometry><box><size>{size_x} {size_y} {size_z}</size></box></geometry>
+        </collision>
+      </link>
+    </model>
+"""
+
+
+def write_world(tmp_path, models):
+    path = tmp_path / "test.world"
+    path.write_text('<?xml version="1.0"?>\n<sdf version="1.6">\n  <world name="default">\n'
+                    + "".join(models) + "  </world>\n</sdf>\n")
+    return str(path)
+
+
+def overlaps(findings):
+    return [message for _, severity, message in findings if severity == "error" and "overlaps" in message]
+
+
+def test_vertically_stacked_boxes_do_not_overlap(tmp_path):
+    # Shelves above each other and the wall piece above a door opening share their footprint, not their height
+    world = write_world(tmp_path, [
+        box_model("low_shelf", 0, 0, 0.2, 0.9, 0.4, 0.02),
+        box_model("high_shelf", 0, 0, 0.8, 0.9, 0.4, 0.02),
+        box_model("wall_beside_door", 2, 0, 1.0, 2.0, 0.15, 2.0),
+        box_model("wall_above_door", 2, 0, 2.25, 2.0, 0.15, 0.5),
+    ])
+    assert overlaps(lint_world(world)) == []
+
+
+def test_boxes_meeting_at_a_junction_do_not_overlap(tmp_path):
+    # A shelf against the back of a bookshelf, and two maze walls meeting at a corner
+    world = write_world(tmp_path, [
+        box_model("back", 0, 0.2, 0.6, 0.9, 0.02, 1.2),
+        box_model("shelf", 0, 0, 0.5, 0.9, 0.42, 0.02),
+        box_model("wall_x", 3.5, 0, 0.5, 1.0, 0.1, 1.0),
+        box_model("wall_y", 4.0, 0.5, 0.5, 0.1, 1.0, 1.0),
+    ])
+    assert overlaps(lint_world(world)) == []
+
+
+def test_walls_stacked_along_a_line_overlap(tmp_path):
+    world = write_world(tmp_path, [
+        box_model("wall_a", 0, 0, 0.5, 2.0, 0.1, 1.0),
+        box_model("wall_b", 1.0, 0, 0.5, 2.0, 0.1, 1.0),
+        box_model("wall_c", 5.0, 0, 0.5, 2.0, 0.1, 1.0),
+        box_model("wall_d", 5.0, 0, 1.2, 2.0, 0.1, 1.0),
+    ])
+    assert len(overlaps(lint_world(world))) == 2
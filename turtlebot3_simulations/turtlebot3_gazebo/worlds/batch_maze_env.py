@@ -0,0 +1,277 @@
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+import yaml
+
+from lidar_raycast import WallRaycaster, lidar_spec
+from world_geometry import read_wall_boxes
+
+# ==========================
+# Environment Parameters
+# ==========================
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(PACKAGE_DIR, "models")
+FAKE_NODE_PARAMS = os.path.join(os.path.dirname(PACKAGE_DIR), "turtlebot3_fake_node", "param")
+ROBOT_RADIUS = {"burger": 0.105, "waffle": 0.220, "waffle_pi": 0.220}  # Footprint radius [m]
+MAX_VELOCITY = {"burger": (0.22, 2.84), "waffle": (0.26, 1.82), "waffle_pi": (0.26, 1.82)}  # [m/s], [rad/s]
+
+SCAN_BEAMS = 24         # Beams per observation, evenly spread over the lidar's samples
+ANGLE_BINS = 360        # Beam directions of the scan table (1 degree apart)
+TABLE_RESOLUTION = 0.05 # Side of a scan table cell [m]
+SPAWN_MARGIN = 0.05     # Extra wall clearance of start and goal poses [m]
+
+CONTROL_PERIOD = 0.1    # Simulated seconds per step
+MAX_EPISODE_STEPS = 500 # Steps before an episode is truncated
+GOAL_RADIUS = 0.2       # Distance at which the goal counts as reached [m]
+GOAL_REWARD = 100.0
+COLLISION_REWARD = -100.0
+PROGRESS_REWARD = 10.0  # Per meter of progress towards the goal
+
+# Discrete actions as in the turtlebot3 DQN stages: drive at 0.15 m/s, turn at (2 - action) * 0.75 rad/s
+DQN_ACTIONS = 5
+DQN_LINEAR_VELOCITY = 0.15
+DQN_ANGULAR_STEP = 0.75
+
+# ==========================
+# Robot and scan tables
+# ==========================
+def wheel_params(model, param_dir=FAKE_NODE_PARAMS):
+    """
+    Return (wheel separation, wheel radius) of a model from turtlebot3_fake_node's param/<model>.yaml.
+    """
+    with open(os.path.join(param_dir, f"{model}.yaml")) as file:
+        wheels = yaml.safe_load(file)["turtlebot3_fake_node"]["ros__parameters"]["wheels"]
+    return float(wheels["separation"]), float(wheels["radius"])
+
+def scan_table(raycaster, resolution=TABLE_RESOLUTION, angle_bins=ANGLE_BINS):
+    """
+    Ray-cast the range from every cell center of a grid over the raycaster's walls in angle_bins
+    directions. Returns (table, origin): table[row, col, bin] (float16, beams with no wall within
+    range_max read range_max) and the world (x, y) of the grid corner, row 0 at the bottom.
+    """
+    x_min, y_min = raycaster.x_min.min(), raycaster.y_min.min()
+    cols = int(math.ceil((raycaster.x_max.max() - x_min) / resolution))
+    rows = int(math.ceil((raycaster.y_max.max() - y_min) / resolution))
+    angles = np.arange(angle_bins) * (2.0 * math.pi / angle_bins)
+    table = np.empty((rows, cols, angle_bins), dtype=np.float16)
+    for row in range(rows):
+        y = y_min + (row + 0.5) * resolution
+        for col in range(cols):
+            ranges = raycaster.cast(x_min + (col + 0.5) * resolution, y, angles)
+            table[row, col] = np.minimum(ranges, raycaster.range_max)
+    return table, (x_min, y_min)
+
+# ==========================
+# Batched environment
+# ==========================
+class BatchMazeEnv:
+    """
+    Gym-style environment stepping num_envs differential drive turtlebots at once in NumPy, each
+    driving to its own goal in the same world (a generated maze or a DQN stage; the DQN obstacles
+    are static here). Robots move like turtlebot3_fake_node: cmd_vel is turned into wheel rotations
+    with the model's wheel separation and radius and integrated over CONTROL_PERIOD.
+    Scans come from a table ray-cast once per world cell and direction (scan_table), so a step is
+    a few array operations and one gather for every robot, whatever the world.
+
+    Observations are float32 (num_envs, scan_beams + 2): scan_beams lidar ranges (max range_max),
+    then the distance and the heading error to the goal. Actions are either one DQN action index
+    per robot (0..4) or (num_envs, 2) cmd_vel (linear, angular). Episodes end on reaching the goal,
+    hitting a wall or after max_episode_steps; finished robots are reset at once, with their final
+    observations in info["final_observation"].
+    """
+    def __init__(self, world, num_envs=1024, model="burger", scan_beams=SCAN_BEAMS,
+                 resolution=TABLE_RESOLUTION, control_period=CONTROL_PERIOD,
+                 max_episode_steps=MAX_EPISODE_STEPS, seed=None):
+        self.num_envs = num_envs
+        self.control_period = control_period
+        self.max_episode_steps = max_episode_steps
+        self.separation, self.wheel_radius = wheel_params(model)
+        self.radius = ROBOT_RADIUS[model]
+        self.max_linear, self.max_angular = MAX_VELOCITY[model]
+        self.rng = np.random.default_rng(seed)
+
+        spec = lidar_spec(os.path.join(MODELS_DIR, f"turtlebot3_{model}", "model.sdf"))
+        boxes = read_wall_boxes(world, [MODELS_DIR], cylinders=True)
+        if len(boxes) == 0:
+            raise ValueError(f"No walls in {world}")
+        self.range_max = spec["range_max"]
+        self.sensor_x, self.sensor_y, _ = spec["pose"]
+        start = time.perf_counter()
+        table, (self.origin_x, self.origin_y) = scan_table(
+            WallRaycaster(boxes, self.range_max), resolution)
+        self.table_time = time.perf_counter() - start
+        self.resolution = resolution
+        self.rows, self.cols, _ = table.shape
+        self.table = table.reshape(-1)
+        # Distance to the nearest wall of every cell: its shortest beam
+        self.clearance = table.min(axis=2).astype(np.float32).reshape(-1)
+        self.free_cells = np.flatnonzero(self.clearance > self.radius + SPAWN_MARGIN)
+        if len(self.free_cells) == 0:
+            raise ValueError(f"No room for a {model} in {world}")
+
+        # Table direction bins of the observed beams for each heading bin: one row gather per step
+        # instead of wrapping every beam of every robot
+        samples = np.linspace(0, spec["samples"], scan_beams, endpoint=False).astype(int)
+        beam_angles = spec["min_angle"] + samples * spec["angle_increment"] + spec["pose"][2]
+        beam_bins = np.round(beam_angles / (2.0 * math.pi / ANGLE_BINS)).astype(np.int64)
+        self.beam_index = (np.arange(ANGLE_BINS)[:, None] + beam_bins) % ANGLE_BINS
+        self.scan_beams = scan_beams
+        self.observation_size = scan_beams + 2
+
+        shape = (num_envs,)
+        self.x, self.y, self.yaw = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+        self.goal_x, self.goal_y = np.zeros(shape), np.zeros(shape)
+        self.goal_distance = np.zeros(shape)
+        self.steps = np.zeros(shape, dtype=np.int64)
+        self.observations = np.zeros((num_envs, self.observation_size), dtype=np.float32)
+
+    def cells(self, x, y):
+        """
+        Return the flat scan table cell of each world (x, y), clipped to the table.
+        """
+        col = np.clip(((x - self.origin_x) / self.resolution).astype(np.int64), 0, self.cols - 1)
+        row = np.clip(((y - self.origin_y) / self.resolution).astype(np.int64), 0, self.rows - 1)
+        return row * self.cols + col
+
+    def cell_centers(self, cells):
+        row, col = np.divmod(cells, self.cols)
+        return (self.origin_x + (col + 0.5) * self.resolution,
+                self.origin_y + (row + 0.5) * self.resolution)
+
+    def observe(self, envs=slice(None)):
+        """
+        Fill and return the observations of envs (all robots by default).
+        """
+        x, y, yaw = self.x[envs], self.y[envs], self.yaw[envs]
+        cos_yaw, sin_yaw = np.cos(yaw), np.sin(yaw)
+        cells = self.cells(x + cos_yaw * self.sensor_x - sin_yaw * self.sensor_y,
+                           y + sin_yaw * self.sensor_x + cos_yaw * self.sensor_y)
+        heading_bin = np.round(yaw * (ANGLE_BINS / (2.0 * math.pi))).astype(np.int64) % ANGLE_BINS
+        observations = self.observations[envs]
+        observations[:, :self.scan_beams] = self.table.take(
+            self.beam_index[heading_bin] + (cells * ANGLE_BINS)[:, None])
+        dx, dy = self.goal_x[envs] - x, self.goal_y[envs] - y
+        observations[:, -2] = np.hypot(dx, dy)
+        observations[:, -1] = (np.arctan2(dy, dx) - yaw + math.pi) % (2.0 * math.pi) - math.pi
+        self.observations[envs] = observations
+        return observations
+
+    def reset_envs(self, envs):
+        """
+        Put the robots `envs` (an index array) on random free cells, facing random directions,
+        each with a goal on another free cell.
+        """
+        count = len(envs)
+        self.x[envs], self.y[envs] = self.cell_centers(self.rng.choice(self.free_cells, count))
+        self.yaw[envs] = self.rng.uniform(-math.pi, math.pi, count)
+        goal_x, goal_y = self.cell_centers(self.rng.choice(self.free_cells, count))
+        # Goals already reached at the start are drawn again
+        close = np.flatnonzero(np.hypot(goal_x - self.x[envs], goal_y - self.y[envs]) < 2.0 * GOAL_RADIUS)
+        while len(close):
+            goal_x[close], goal_y[close] = self.cell_centers(self.rng.choice(self.free_cells, len(close)))
+            close = close[np.hypot(goal_x[close] - self.x[envs][close], goal_y[close] - self.y[envs][close])
+                          < 2.0 * GOAL_RADIUS]
+        self.goal_x[envs], self.goal_y[envs] = goal_x, goal_y
+        self.goal_distance[envs] = np.hypot(goal_x - self.x[envs], goal_y - self.y[envs])
+        self.steps[envs] = 0
+
+    def reset(self, seed=None):
+        """
+        Reset every robot; returns (observations, info).
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(np.arange(self.num_envs))
+        return self.observe().copy(), {}
+
+    def step(self, actions):
+        """
+        Apply one action per robot for control_period seconds.
+        Returns (observations, rewards, terminated, truncated, info).
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 1:
+            linear = DQN_LINEAR_VELOCITY
+            angular = ((DQN_ACTIONS - 1) / 2 - actions) * DQN_ANGULAR_STEP
+        else:
+            linear, angular = actions[:, 0], actions[:, 1]
+        linear = np.clip(linear, -self.max_linear, self.max_linear)
+        angular = np.clip(angular, -self.max_angular, self.max_angular)
+
+        # Wheel rotations over the step, then the odometry update of turtlebot3_fake_node
+        wheel_left = (linear - angular * self.separation / 2.0) / self.wheel_radius * self.control_period
+        wheel_right = (linear + angular * self.separation / 2.0) / self.wheel_radius * self.control_period
+        delta_s = self.wheel_radius * (wheel_right + wheel_left) / 2.0
+        delta_theta = self.wheel_radius * (wheel_right - wheel_left) / self.separation
+        heading = self.yaw + delta_theta / 2.0
+        self.x += delta_s * np.cos(heading)
+        self.y += delta_s * np.sin(heading)
+        self.yaw += delta_theta
+        self.steps += 1
+
+        observations = self.observe()
+        distance = observations[:, -2].astype(np.float64)
+        collided = self.clearance[self.cells(self.x, self.y)] < self.radius
+        reached = distance < GOAL_RADIUS
+        rewards = PROGRESS_REWARD * (self.goal_distance - distance)
+        rewards[reached] += GOAL_REWARD
+        rewards[collided] += COLLISION_REWARD
+        self.goal_distance = distance
+        terminated = collided | reached
+        truncated = (self.steps >= self.max_episode_steps) & ~terminated
+
+        info = {}
+        done = np.flatnonzero(terminated | truncated)
+        if len(done):
+            info["final_observation"] = observations[done].copy()
+            info["done"] = done
+            self.reset_envs(done)
+            self.observe(done)
+        return self.observations.copy(), rewards, terminated, truncated, info
+
+# ==========================
+# Throughput report
+# ==========================
+def measure_throughput(world, num_envs, steps, model="burger", scan_beams=SCAN_BEAMS,
+                       resolution=TABLE_RESOLUTION, seed=0):
+    """
+    Step num_envs robots with random DQN actions for `steps` steps and print the table build time
+    and the robot-steps per second.
+    """
+    env = BatchMazeEnv(world, num_envs, model, scan_beams, resolution, seed=seed)
+    print(f"{os.path.basename(world)}: scan table {env.rows}x{env.cols}x{ANGLE_BINS} "
+          f"({env.table.nbytes / 1e6:.1f} MB) built in {env.table_time:.2f} s, "
+          f"{len(env.free_cells)} free cells")
+    actions = env.rng.integers(0, DQN_ACTIONS, (steps, num_envs))
+    env.reset()
+    episodes = goals = collisions = 0
+    start = time.perf_counter()
+    for step_actions in actions:
+        _, rewards, terminated, truncated, info = env.step(step_actions)
+        if "done" in info:
+            episodes += len(info["done"])
+            goals += int(np.count_nonzero(rewards[terminated] > GOAL_REWARD / 2))
+            collisions += int(np.count_nonzero(rewards[terminated] < COLLISION_REWARD / 2))
+    elapsed = time.perf_counter() - start
+    rate = steps * num_envs / elapsed
+    print(f"{num_envs} robots x {steps} steps in {elapsed:.2f} s: {rate / 1e6:.2f} M steps/s "
+          f"({rate * env.control_period:,.0f} simulated robot-seconds per second); "
+          f"{episodes} episodes ended ({goals} goals, {collisions} collisions)")
+    return rate
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the throughput of the batched maze environment.")
+    parser.add_argument("--world", default="maze_world.world", help="maze or DQN stage world file")
+    parser.add_argument("--envs", type=int, default=4096, help="robots stepped at once")
+    parser.add_argument("--steps", type=int, default=500, help="steps to run")
+    parser.add_argument("--model", choices=sorted(ROBOT_RADIUS), default="burger")
+    parser.add_argument("--beams", type=int, default=SCAN_BEAMS, help="scan beams per observation")
+    parser.add_argument("--resolution", type=float, default=TABLE_RESOLUTION,
+                        help="scan table cell size [m]; the table takes (world area / resolution^2) ray casts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    measure_throughput(args.world, args.envs, args.steps, args.model, args.beams, args.resolution, args.seed)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from generate_heat_source import generate_positions, heat_field, integrate_lights_into_world, maze_bounds
+from generate_maze import (
+    MAZE_ALGORITHMS,
+    WORLD_FOOTER,
+    WORLD_HEADER,
+    generate_prim_maze,
+    maze_wall_segments,
+    maze_walls_to_sdf,
+    save_maze_to_world,
+    write_atomically,
+)
+from world_geometry import read_wall_boxes
+
+# ==========================
+# Benchmark Parameters
+# ==========================
+GRID_SIZES = (10, 50, 100, 250, 500)
+HEAT_SOURCE_COUNTS = (1, 3, 10, 30)
+HEAT_WORLD_GRID_SIZE = 100  # Maze the heat sources are injected into
+REPEATS = 3         # Best-of-N timing
+SEED = 0
+SUITES = ("algorithms", "maze", "heat")
+
+# ==========================
+# Measurement helpers
+# ==========================
+def best_time(func, repeats=REPEATS):
+    """
+    Return the fastest wall time of `repeats` calls to func, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_memory(func):
+    """
+    Return the peak traced Python memory of one call to func, in bytes.
+    Measured in a separate call from the timing, since tracemalloc slows allocation down.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measure(benchmark, func, repeats=REPEATS, **params):
+    """
+    Time func and record its peak memory as one result row, and print it.
+    """
+    row = {"benchmark": benchmark, **params,
+           "seconds": best_time(func, repeats), "peak_bytes": peak_memory(func)}
+    label = " ".join(f"{key}={value}" for key, value in params.items())
+    print(f"{benchmark:<22}{label:<36}{row['seconds'] * 1000:>12.2f} ms{row['peak_bytes'] / 1024:>12.0f} KiB")
+    return row
+
+def consume(iterable):
+    """
+    Exhaust an iterator without keeping its items.
+    """
+    for _ in iterable:
+        pass
+
+def git_revision():
+    """
+    Return the current git commit of this checkout, or None outside a git repository.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# ==========================
+# Maze algorithms
+# ==========================
+def benchmark_algorithms(grid_sizes=GRID_SIZES, repeats=REPEATS, seed=SEED):
+    """
+    Time every maze algorithm and record its peak memory for each grid size.
+    Rows are consumed one by one and dropped, as the SDF emitter does, so streaming
+    algorithms show their O(grid_size) footprint.
+    """
+    results = []
+    for name, algorithm in MAZE_ALGORITHMS.items():
+        for grid_size in grid_sizes:
+            results.append(measure(
+                "maze_algorithm", lambda: consume(algorithm(grid_size, random.Random(seed))),
+                repeats, algorithm=name, grid_size=grid_size))
+    return results
+
+# ==========================
+# Maze generation pipeline stages
+# ==========================
+def benchmark_maze(grid_sizes=GRID_SIZES, repeats=REPEATS, seed=SEED):
+    """
+    Time each stage of writing a maze world separately for every grid size:
+    generate_prim_maze, SDF emission (segments + snippets, discarded), writing already
+    emitted SDF to disk, and the whole save_maze_to_world pipeline.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "maze.world")
+        for grid_size in grid_sizes:
+            walls = generate_prim_maze(grid_size, random.Random(seed))
+            chunks = [WORLD_HEADER, *maze_walls_to_sdf(maze_wall_segments(*walls)), WORLD_FOOTER]
+
+            results.append(measure(
+                "generate_prim_maze", lambda: generate_prim_maze(grid_size, random.Random(seed)),
+                repeats, grid_size=grid_size))
+            results.append(measure(
+                "sdf_emission", lambda: consume(maze_walls_to_sdf(maze_wall_segments(*walls))),
+                repeats, grid_size=grid_size))
+            results.append(measure(
+                "file_write", lambda: write_atomically(path, chunks),
+                repeats, grid_size=grid_size))
+            results.append(measure(
+                "save_maze_to_world", lambda: save_maze_to_world(path, grid_size, seed=seed, verbose=False),
+                repeats, grid_size=grid_size))
+    return results
+
+# ==========================
+# Heat source injection
+# ==========================
+def benchmark_heat_sources(counts=HEAT_SOURCE_COUNTS, repeats=REPEATS, seed=SEED,
+                           grid_size=HEAT_WORLD_GRID_SIZE):
+    """
+    Time integrate_lights_into_world, and the heat field of the same number of sources with and
+    without wall occlusion, for each heat-source count on one generated maze world.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        world_path = os.path.join(tmp_dir, "maze.world")
+        output_path = os.path.join(tmp_dir, "maze_with_heat.world")
+        save_maze_to_world(world_path, grid_size, seed=seed, verbose=False)
+        for count in counts:
+            def run():
+                random.seed(seed)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    integrate_lights_into_world(world_path, output_path, count)
+            results.append(measure("integrate_lights", run, repeats, count=count, grid_size=grid_size))
+
+        walls = read_wall_boxes(world_path)
+        bounds = maze_bounds(walls)
+        for count in counts:
+            positions = generate_positions(count, bounds, walls, rng=random.Random(seed))
+            for occlusion in (False, True):
+                results.append(measure(
+                    "heat_field", lambda: heat_field(positions, bounds, walls, occlusion=occlusion),
+                    repeats, count=count, grid_size=grid_size, occlusion=occlusion))
+    return results
+
+# ==========================
+# Compare against an earlier run
+# ==========================
+def compare_results(results, baseline_path):
+    """
+    Print the time and memory ratio of every result against the matching row of a saved run.
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+
+    def key(row):
+        return tuple(sorted((k, v) for k, v in row.items() if k not in ("seconds", "peak_bytes")))
+
+    previous = {key(row): row for row in baseline["results"]}
+    print(f"\nCompared with {baseline_path} ({baseline.get('git_revision')}):")
+    for row in results:
+        old = previous.get(key(row))
+        if old is None:
+            continue
+        label = " ".join(f"{k}={v}" for k, v in row.items() if k not in ("seconds", "peak_bytes"))
+        print(f"{label:<60}time x{row['seconds'] / old['seconds']:>6.2f}"
+              f"   memory x{row['peak_bytes'] / max(old['peak_bytes'], 1):>6.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the world generation scripts.")
+    parser.add_argument("--suite", choices=SUITES, nargs="+", default=list(SUITES))
+    parser.add_argument("--grid-sizes", type=int, nargs="+", default=list(GRID_SIZES))
+    parser.add_argument("--heat-counts", type=int, nargs="+", default=list(HEAT_SOURCE_COUNTS))
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<22}{'parameters':<36}{'time':>15}{'peak memory':>16}")
+    results = []
+    if "algorithms" in args.suite:
+        results += benchmark_algorithms(args.grid_sizes, args.repeats)
+    if "maze" in args.suite:
+        results += benchmark_maze(args.grid_sizes, args.repeats)
+    if "heat" in args.suite:
+        results += benchmark_heat_sources(args.heat_counts, args.repeats)
+
+    report = {
+        "git_revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare_results(results, args.compare)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import time
+
+# ==========================
+# Comparison Parameters
+# ==========================
+LAUNCH_FILE = "maze_world.launch.py"
+PROFILES = {"gui": "false", "headless": "true"}  # Profile name -> headless launch argument
+STARTUP_TOPIC = "/odom"     # Bringup counts as done once the robot's odometry is flowing
+STARTUP_TIMEOUT = 120.0     # Seconds to wait for the first STARTUP_TOPIC message
+CPU_WINDOW = 10.0           # Seconds of steady state CPU sampling after startup
+SHUTDOWN_TIMEOUT = 30.0     # Seconds to wait for the launch to exit after SIGINT
+
+# ==========================
+# CPU time of a process tree (Linux /proc)
+# ==========================
+def process_tree(root_pid):
+    """
+    Return the pids of root_pid and all of its descendants.
+    """
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as file:
+                # The command name may contain spaces; fields after it are space separated
+                fields = file.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    pids = [root_pid]
+    for pid in pids:
+        pids.extend(children.get(pid, ()))
+    return pids
+
+def cpu_seconds(pids):
+    """
+    Return the user + system CPU time used so far by pids, skipping processes that have exited.
+    """
+    ticks = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as file:
+                fields = file.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        ticks += int(fields[11]) + int(fields[12])  # utime, stime
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+# ==========================
+# Launch one profile
+# ==========================
+def profile_launch(headless, cpu_window=CPU_WINDOW, startup_timeout=STARTUP_TIMEOUT):
+    """
+    Launch the maze world with headless:=<headless> and return (startup seconds, steady-state CPU %),
+    where startup is the time until the first STARTUP_TOPIC message and CPU is summed over every
+    process of the launch (100% = one core) during cpu_window seconds after startup.
+    """
+    launch = subprocess.Popen(
+        ["ros2", "launch", "turtlebot3_gazebo", LAUNCH_FILE, f"headless:={headless}"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    start = time.perf_counter()
+    try:
+        subprocess.run(["ros2", "topic", "echo", "--once", STARTUP_TOPIC], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=startup_timeout)
+        startup = time.perf_counter() - start
+
+        pids = process_tree(launch.pid)
+        before = cpu_seconds(pids)
+        time.sleep(cpu_window)
+        cpu = (cpu_seconds(pids) - before) / cpu_window * 100.0
+        return startup, cpu
+    finally:
+        os.killpg(launch.pid, signal.SIGINT)
+        try:
+            launch.wait(timeout=SHUTDOWN_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            os.killpg(launch.pid, signal.SIGKILL)
+            launch.wait()
+
+# ==========================
+# Compare launch profiles
+# ==========================
+def compare_profiles(cpu_window=CPU_WINDOW, startup_timeout=STARTUP_TIMEOUT):
+    """
+    Profile every entry of PROFILES in turn and print startup time and steady-state CPU.
+    """
+    results = {name: profile_launch(headless, cpu_window, startup_timeout) for name, headless in PROFILES.items()}
+
+    print(f"\n{LAUNCH_FILE}: startup until first {STARTUP_TOPIC} message, CPU over {cpu_window:g} s after it")
+    print(f"{'profile':<10}{'startup [s]':>14}{'CPU [%]':>12}")
+    for name, (startup, cpu) in results.items():
+        print(f"{name:<10}{startup:>14.2f}{cpu:>12.1f}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare startup time and CPU of the GUI and headless maze launch.")
+    parser.add_argument("--cpu-window", type=float, default=CPU_WINDOW, help="seconds of CPU sampling")
+    parser.add_argument("--startup-timeout", type=float, default=STARTUP_TIMEOUT)
+    args = parser.parse_args()
+
+    if shutil.which("ros2") is None:
+        parser.error("`ros2` was not found on PATH; source your ROS 2 workspace first")
+    if "TURTLEBOT3_MODEL" not in os.environ:
+        parser.error("set TURTLEBOT3_MODEL (e.g. burger) first")
+    compare_profiles(args.cpu_window, args.startup_timeout)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+
+from generate_maze import save_maze_to_world
+
+# ==========================
+# Comparison Parameters
+# ==========================
+GRID_SIZE = 100     # Large enough that per-entity overhead dominates
+STEP_ITERATIONS = 5000  # Physics iterations used to measure step time
+SEED = 0            # Same maze in every layout
+LAYOUTS = ("models", "single")
+PHYSICS = "fast"    # Unpaced physics, so step time is the cost of a step and not the real time pacing
+
+# <include> of a model fetched over the network (Fuel): its download time would count as load time
+NETWORK_INCLUDE = re.compile(r"\s*<include>\s*<uri>\s*https?://.*?</include>", re.DOTALL)
+
+# ==========================
+# Comparison world
+# ==========================
+def write_comparison_world(world_path, grid_size, layout, seed):
+    """
+    Write the seeded maze in `layout` with the unpaced physics profile and without Fuel includes
+    (ground plane, sun): static walls need neither, and nothing is downloaded while timing.
+    """
+    save_maze_to_world(world_path, grid_size, layout, seed, physics=PHYSICS, verbose=False)
+    with open(world_path) as file:
+        world = file.read()
+    with open(world_path, "w") as file:
+        file.write(NETWORK_INCLUDE.sub("", world))
+
+# ==========================
+# Run a headless gz server for a fixed number of iterations
+# ==========================
+def time_gz_run(world_path, iterations):
+    """
+    Run `gz sim` headless on world_path for `iterations` steps and return the wall time in seconds.
+    """
+    command = ["gz", "sim", "-s", "-r", "--headless-rendering", "-v", "0",
+               "--iterations", str(iterations), world_path]
+    start = time.perf_counter()
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+# ==========================
+# Compare world layouts
+# ==========================
+def compare_layouts(grid_size=GRID_SIZE, iterations=STEP_ITERATIONS, seed=SEED):
+    """
+    Generate the same seeded maze in every layout and report world load time and per-step time.
+    Load time is a 1-iteration run; step time is the extra wall time of a long run, per iteration.
+    Worlds run unpaced (PHYSICS) and offline, so both measure the layout and not gz's pacing or Fuel.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for layout in LAYOUTS:
+            world_path = os.path.join(tmp_dir, f"maze_{layout}.world")
+            write_comparison_world(world_path, grid_size, layout, seed)
+            load_time = time_gz_run(world_path, 1)
+            run_time = time_gz_run(world_path, iterations + 1)
+            results[layout] = (load_time, (run_time - load_time) / iterations)
+
+    print(f"\n{grid_size}x{grid_size} maze, {iterations} iterations")
+    print(f"{'layout':<10}{'load [s]':>12}{'step [ms]':>12}")
+    for layout, (load_time, step_time) in results.items():
+        print(f"{layout:<10}{load_time:>12.3f}{step_time * 1000:>12.4f}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Gazebo load and step time of maze wall layouts.")
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE)
+    parser.add_argument("--iterations", type=int, default=STEP_ITERATIONS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+
+    if shutil.which("gz") is None:
+        parser.error("`gz` was not found on PATH; source your Gazebo installation first")
+    compare_layouts(args.grid_size, args.iterations, args.seed)
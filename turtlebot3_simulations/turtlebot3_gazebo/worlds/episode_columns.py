@@ -0,0 +1,132 @@
+import json
+import os
+
+import numpy as np
+
+from generate_maze import write_atomically
+
+# ==========================
+# Column File Parameters
+# ==========================
+CHUNK_ROWS = 1024       # Rows buffered in memory before they are appended to a column file
+HEADER_SIZE = 128       # Bytes of every column's .npy header, fixed so the row count can be patched in place
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+EPISODE_FILE = "episode.json"
+
+# ==========================
+# One field: an appendable .npy file
+# ==========================
+class ColumnWriter:
+    """
+    Append-only .npy file of fixed-dtype rows (shape (rows, *row_shape)). Rows are buffered
+    CHUNK_ROWS at a time; each flush appends the chunk and rewrites the fixed-size header with
+    the new row count, so the file is a valid, memory-mappable array after every chunk.
+    """
+    def __init__(self, path, dtype, row_shape=(), chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.chunk = np.empty((chunk_rows, *self.row_shape), dtype=self.dtype)
+        self.buffered = 0
+        self.rows = 0
+        self.file = open(path, "wb")
+        self.write_header()
+
+    def write_header(self):
+        header = repr({"descr": np.lib.format.dtype_to_descr(self.dtype), "fortran_order": False,
+                       "shape": (self.rows, *self.row_shape)})
+        header_len = HEADER_SIZE - len(NPY_MAGIC) - 2
+        self.file.seek(0)
+        self.file.write(NPY_MAGIC + header_len.to_bytes(2, "little") + header.ljust(header_len - 1).encode() + b"\n")
+        self.file.seek(0, os.SEEK_END)
+
+    def append(self, value):
+        self.chunk[self.buffered] = value
+        self.buffered += 1
+        if self.buffered == len(self.chunk):
+            self.flush()
+
+    def flush(self):
+        if not self.buffered:
+            return
+        self.file.write(self.chunk[:self.buffered].tobytes())
+        self.rows += self.buffered
+        self.buffered = 0
+        self.write_header()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+# ==========================
+# One stream: a timestamp index plus its fields
+# ==========================
+class StreamWriter:
+    """
+    Columns of one message stream in <episode>/<stream>/: stamp.npy (int64 nanoseconds, the
+    timestamp index) and one <field>.npy per entry of fields (name -> (dtype, row shape)).
+    """
+    def __init__(self, directory, fields, chunk_rows=CHUNK_ROWS):
+        os.makedirs(directory, exist_ok=True)
+        self.fields = {"stamp": ("int64", ()), **fields}
+        self.columns = {name: ColumnWriter(os.path.join(directory, f"{name}.npy"), dtype, shape, chunk_rows)
+                        for name, (dtype, shape) in self.fields.items()}
+
+    def append(self, stamp, **values):
+        # Every value is checked before any column grows, so a rejected row (ValueError) leaves
+        # all columns the same length
+        if values.keys() != self.fields.keys() - {"stamp"}:
+            raise ValueError(f"Expected fields {sorted(self.fields.keys() - {'stamp'})}, got {sorted(values)}")
+        for name, value in values.items():
+            if np.shape(value) != self.columns[name].row_shape:
+                raise ValueError(f"{name} has shape {np.shape(value)}, expected {self.columns[name].row_shape}")
+        self.columns["stamp"].append(stamp)
+        for name, value in values.items():
+            self.columns[name].append(value)
+
+    @property
+    def rows(self):
+        return self.columns["stamp"].rows + self.columns["stamp"].buffered
+
+    def nbytes(self):
+        return sum(os.path.getsize(column.path) for column in self.columns.values())
+
+    def close(self):
+        for column in self.columns.values():
+            column.close()
+
+def write_episode_metadata(directory, streams, metadata=None):
+    """
+    Write <episode>/episode.json: the fields (dtype, row shape) of every stream and any extra metadata.
+    The file is replaced atomically, so it can be rewritten while recording (e.g. when a stream
+    is opened) and a recording killed at any point still leaves a loadable description.
+    """
+    description = {
+        "streams": {name: {field: {"dtype": dtype, "shape": list(shape)} for field, (dtype, shape)
+                           in stream.fields.items()} for name, stream in streams.items()},
+        **(metadata or {}),
+    }
+    os.makedirs(directory, exist_ok=True)
+    write_atomically(os.path.join(directory, EPISODE_FILE), [json.dumps(description, indent=2)])
+
+# ==========================
+# Reading an episode back
+# ==========================
+def load_episode(directory):
+    """
+    Memory-map every column of a recorded episode: {stream: {field: array}}, with the
+    stream's timestamp index under "stamp". Nothing is read until the arrays are used.
+    """
+    with open(os.path.join(directory, EPISODE_FILE)) as file:
+        description = json.load(file)
+    return {stream: {field: np.load(os.path.join(directory, stream, f"{field}.npy"), mmap_mode="r")
+                     for field in fields}
+            for stream, fields in description["streams"].items()}
+
+def rows_at(stamps, times):
+    """
+    Return the index of the latest row stamped at or before each of `times` (-1 before the first row),
+    e.g. to line up odometry with scans: odom["x"][rows_at(odom["stamp"], scan["stamp"])].
+    """
+    return np.searchsorted(stamps, times, side="right") - 1
@@ -1,4 +1,30 @@
+import argparse
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
 import random
+import tempfile
+
+import numpy as np
+
+from maze_algorithms import (
+    eller_maze_rows,
+    generate_backtracker_maze,
+    generate_kruskal_maze,
+    iter_maze_rows,
+    wall_arrays,
+)
+from maze_distances import (
+    add_cell_graph_row,
+    copy_distance_tables,
+    parse_cell,
+    resolve_goals,
+    write_distance_tables,
+)
+from occupancy_map import copy_occupancy_map, write_occupancy_map
+from physics_profiles import PHYSICS_PROFILE, PHYSICS_PROFILES, with_physics_profile
 
 # ==========================
 # Maze Configuration Parameters
@@ -7,272 +33,607 @@ CELL_SIZE = 0.5      # Distance between cells
 WALL_THICKNESS = 0.1 # Thickness of each wall
 WALL_HEIGHT = 1.0    # Height of each wall
 GRID_SIZE = 10       # Size of the maze grid (NxN)
+COALESCE_WALLS = True # Merge adjacent collinear walls into one long wall
+WALL_LAYOUT = "models" # "models": one static model per wall, "single": one static "maze" model holding every wall
+MAZE_ALGORITHM = "prim" # Any key of MAZE_ALGORITHMS
+
+# ==========================
+# Maze World Cache
+# ==========================
+CACHE_VERSION = 2    # Bump whenever the generated world changes for the same parameters
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "turtlebot3_gazebo", "mazes")
+
+# ==========================
+# World file around the maze walls
+# ==========================
+WORLD_HEADER = """<?xml version="1.0" ?>
+<sdf version="1.6">
+  <world name="prim_maze_world">
+
+    <!-- Plugins -->
+    <plugin filename="gz-sim-physics-system" name="gz::sim::systems::Physics"/>
+    <plugin filename="gz-sim-user-commands-system" name="gz::sim::systems::UserCommands"/>
+    <plugin filename="gz-sim-scene-broadcaster-system" name="gz::sim::systems::SceneBroadcaster"/>
+    <plugin filename="gz-sim-sensors-system" name="gz::sim::systems::Sensors">
+      <render_engine>ogre2</render_engine>
+    </plugin>
+    <plugin filename="gz-sim-imu-system" name="gz::sim::systems::Imu"/>
+
+    <!-- Basic Environment (Fuel URIs) -->
+    <include>
+      <uri>https://fuel.gazebosim.org/1.0/OpenRobotics/models/Ground Plane</uri>
+    </include>
+    <include>
+      <uri>https://fuel.gazebosim.org/1.0/OpenRobotics/models/Sun</uri>
+    </include>
+
+    <!-- Maze Walls -->
+    """
+
+WORLD_FOOTER = """
+
+    <!-- Camera Configuration -->
+    <gui fullscreen="0">
+      <camera name="user_camera">
+        <pose>0 0 10 0 1.5708 0</pose>
+        <view_controller>orbit</view_controller>
+      </camera>
+    </gui>
+
+    <!-- Physics Configuration -->
+    <physics type="ode">
+      <real_time_update_rate>1000.0</real_time_update_rate>
+      <max_step_size>0.001</max_step_size>
+      <real_time_factor>1</real_time_factor>
+    </physics>
+
+  </world>
+</sdf>
+"""
 
 # ==========================
 # Helper: Convert (row,col) to (x,y) in world coordinates
 # ==========================
-def cell_center_position(row, col):
+def cell_center_position(row, col, grid_size=GRID_SIZE, cell_size=CELL_SIZE):
     """
     Convert grid indices (row, col) into Gazebo world coordinates (x, y).
-    We shift by GRID_SIZE/2 so that the maze is centered around (0,0).
+    We shift by grid_size/2 so that the maze is centered around (0,0).
+    row and col may also be NumPy index arrays, in which case arrays are returned.
     """
     # Notice that row corresponds to "y" and col corresponds to "x" for many setups,
     # but we can choose whichever orientation we prefer as long as we are consistent.
-    x = (col - (GRID_SIZE / 2)) * CELL_SIZE + (CELL_SIZE / 2)
-    y = (row - (GRID_SIZE / 2)) * CELL_SIZE + (CELL_SIZE / 2)
+    x = (col - (grid_size / 2)) * cell_size + (cell_size / 2)
+    y = (row - (grid_size / 2)) * cell_size + (cell_size / 2)
     return x, y
 
 # ==========================
 # Create a wall SDF snippet
 # ==========================
-def create_wall(x, y, length, orientation):
+def create_wall(x, y, length, orientation, name=None, thickness=WALL_THICKNESS, height=WALL_HEIGHT):
     """
     Create an SDF wall with collision enabled at (x, y) with a certain length and orientation.
     orientation in radians: 0 => wall extends in x-dim, 1.5708 => extends in y-dim, etc.
+    name defaults to one derived from the wall position.
     """
+    if name is None:
+        name = f"wall_{x:.2f}_{y:.2f}"
     return f"""
-    <model name="wall_{x:.2f}_{y:.2f}">
+    <model name="{name}">
       <static>true</static>
       <link name="link">
         <collision name="collision">
           <geometry>
             <box>
-              <size>{length} {WALL_THICKNESS} {WALL_HEIGHT}</size>
+              <size>{length} {thickness} {height}</size>
             </box>
           </geometry>
         </collision>
         <visual name="visual">
           <geometry>
             <box>
-              <size>{length} {WALL_THICKNESS} {WALL_HEIGHT}</size>
+              <size>{length} {thickness} {height}</size>
             </box>
           </geometry>
         </visual>
       </link>
-      <pose>{x:.3f} {y:.3f} {WALL_HEIGHT/2} 0 0 {orientation}</pose>
+      <pose>{x:.3f} {y:.3f} {height/2} 0 0 {orientation}</pose>
     </model>
     """
 
+# ==========================
+# Create a wall collision/visual pair SDF snippet
+# ==========================
+def create_wall_geometry(x, y, length, orientation, name, thickness=WALL_THICKNESS, height=WALL_HEIGHT):
+    """
+    Create the collision/visual pair of a wall, posed at (x, y) inside a shared link.
+    Used by the "single" layout, where every wall lives in one static model.
+    """
+    return f"""
+        <collision name="{name}_collision">
+          <pose>{x:.3f} {y:.3f} {height/2} 0 0 {orientation}</pose>
+          <geometry>
+            <box>
+              <size>{length} {thickness} {height}</size>
+            </box>
+          </geometry>
+        </collision>
+        <visual name="{name}_visual">
+          <pose>{x:.3f} {y:.3f} {height/2} 0 0 {orientation}</pose>
+          <geometry>
+            <box>
+              <size>{length} {thickness} {height}</size>
+            </box>
+          </geometry>
+        </visual>"""
+
 # ==========================
 # Prim's Maze Generation (Remove Walls)
 # ==========================
-def generate_prim_maze():
+def generate_prim_maze(grid_size=GRID_SIZE, rng=random):
     """
     Generate a maze by removing walls using a typical Prim's approach:
     - Start with all walls present (vertical_walls & horizontal_walls = True).
     - Randomly pick a cell, mark visited.
     - Add its walls to a frontier list.
     - While frontier list not empty, pick a wall that connects visited/unvisited -> remove it, add new cell's walls.
-    - Convert the resulting wall structure into SDF snippets.
-    - Add outer bounding walls.
+
+    Cells and walls are stored as flat bytearrays indexed by integer ids so the
+    main loop stays O(1) per step, which keeps 500x500 grids well under a second:
+    - cell (r,c) has id r*grid_size + c
+    - vertical wall between (r,c) and (r,c+1) has id r*(grid_size-1) + c
+    - horizontal wall between (r,c) and (r+1,c) has id num_vertical + r*grid_size + c
+
+    rng is the random source (the random module or a seeded random.Random).
+
+    Returns (vertical_walls, horizontal_walls) as boolean NumPy arrays:
+    - vertical_walls[r][c] = True means there's a wall between (r,c) and (r,c+1)
+    - horizontal_walls[r][c] = True means there's a wall between (r,c) and (r+1,c)
     """
-    # Track which cells have been visited
-    visited = [[False]*GRID_SIZE for _ in range(GRID_SIZE)]
-
-    # For a grid of NxN cells:
-    # vertical_walls[r][c] = True means there's a wall between (r,c) and (r,c+1)
-    vertical_walls = [[True]*(GRID_SIZE-1) for _ in range(GRID_SIZE)]
-    # horizontal_walls[r][c] = True means there's a wall between (r,c) and (r+1,c)
-    horizontal_walls = [[True]*GRID_SIZE for _ in range(GRID_SIZE-1)]
-
-    # Helper to get neighbors
-    def get_neighbors(r, c):
-        """ Return valid neighbor cells of (r,c). """
-        offsets = [(-1,0),(1,0),(0,-1),(0,1)]
-        for dr, dc in offsets:
-            nr, nc = r+dr, c+dc
-            if 0 <= nr < GRID_SIZE and 0 <= nc < GRID_SIZE:
-                yield nr, nc
-
-    # Return the list of "walls" that surround a given cell.
-    # Each wall is represented by a tuple: (r1, c1, r2, c2).
-    # (r1,c1) is the cell on one side, (r2,c2) is the cell on the other side.
-    def cell_walls(r, c):
-        walls = []
-        for nr, nc in get_neighbors(r,c):
-            # If neighbor is directly to the right
-            if nr == r and nc == c+1:
-                walls.append((r, c, r, c+1))  # vertical
-            # left
-            elif nr == r and nc == c-1:
-                walls.append((r, c-1, r, c))  # vertical
-            # down
-            elif nr == r+1 and nc == c:
-                walls.append((r, c, r+1, c))  # horizontal
-            # up
-            elif nr == r-1 and nc == c:
-                walls.append((r-1, c, r, c))  # horizontal
-        return walls
+    n = grid_size
+    num_vertical = n * (n - 1)
+    num_walls = num_vertical + (n - 1) * n
 
-    # Pick a random start cell
-    start_r = random.randint(0, GRID_SIZE-1)
-    start_c = random.randint(0, GRID_SIZE-1)
-    visited[start_r][start_c] = True
+    # Track which cells have been visited
+    visited = bytearray(n * n)
+    # Every wall starts present
+    walls = bytearray(b"\x01") * num_walls
+    # Marks walls already pushed to the frontier so each one is queued at most once
+    queued = bytearray(num_walls)
 
-    # Frontier "walls" = edges that connect our visited region to unvisited cells
     frontier = []
-    frontier.extend(cell_walls(start_r, start_c))
+    push = frontier.append
+    pop = frontier.pop
+    rand = rng.random
+    last_cell = n * n
+
+    # Pick a random start cell
+    new_cell = rng.randrange(n * n)
 
     # Prim's main loop
-    while frontier:
-        # Randomly pick one wall from frontier
-        w = random.choice(frontier)
-        frontier.remove(w)
-
-        # Wall is between (r1,c1) and (r2,c2)
-        r1, c1, r2, c2 = w
-
-        # If one side is visited and the other is unvisited => remove the wall
-        if visited[r1][c1] != visited[r2][c2]:
-            # Identify which side is unvisited
-            if not visited[r1][c1]:
-                r_new, c_new = r1, c1
-            else:
-                r_new, c_new = r2, c2
-
-            # Mark that cell as visited
-            visited[r_new][c_new] = True
-            # Add its walls to frontier
-            frontier.extend(cell_walls(r_new, c_new))
-
-            # Remove that wall from our data structure
-            # If it's horizontal or vertical depends on row vs col
-            if r1 == r2:
-                # same row, so it's a vertical wall
-                # between (r1, c1) and (r1, c1+1) if c2 == c1+1
-                c_left = min(c1, c2)
-                vertical_walls[r1][c_left] = False
+    while True:
+        # Mark the new cell visited and push its walls that lead to unvisited
+        # neighbors (vertical wall ids are cell - row, i.e. cell - cell // n)
+        visited[new_cell] = 1
+        c = new_cell % n
+        w = new_cell - new_cell // n
+        # right
+        if c != n - 1 and not visited[new_cell + 1] and not queued[w]:
+            queued[w] = 1
+            push(w)
+        # left
+        if c and not visited[new_cell - 1] and not queued[w - 1]:
+            queued[w - 1] = 1
+            push(w - 1)
+        # down
+        w = num_vertical + new_cell
+        if new_cell + n < last_cell and not visited[new_cell + n] and not queued[w]:
+            queued[w] = 1
+            push(w)
+        # up
+        w -= n
+        if new_cell >= n and not visited[new_cell - n] and not queued[w]:
+            queued[w] = 1
+            push(w)
+
+        # Randomly pick walls from the frontier (swap-pop, O(1)) until one
+        # connects the visited region to an unvisited cell
+        new_cell = -1
+        while frontier:
+            i = int(rand() * len(frontier))
+            w = frontier[i]
+            last = pop()
+            if i < len(frontier):
+                frontier[i] = last
+
+            # Wall is between cells a and b
+            if w < num_vertical:
+                a = w + w // (n - 1)
+                b = a + 1
             else:
-                # same column, so it's a horizontal wall
-                # between (r1, c1) and (r1+1, c1) if r2 == r1+1
-                r_top = min(r1, r2)
-                horizontal_walls[r_top][c1] = False
+                a = w - num_vertical
+                b = a + n
 
-    # --------------------------------
-    # Convert the wall structures into SDF
-    # --------------------------------
-    sdf_parts = []
-
-    # 1) Add internal vertical walls
-    # vertical_walls[r][c] = True => there's a vertical wall between (r,c) and (r,c+1)
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE - 1):
-            if vertical_walls[r][c]:
-                # The wall runs vertically, so it extends in the y-dim,
-                # meaning orientation = 1.5708 (90 deg)
-                # The center is halfway between these two cells in x.
-                # Let's figure out the (x, y) of that "edge"
-                # We'll do "cell_center_position" for cell (r,c) and cell (r,c+1) and average them
-                x1, y1 = cell_center_position(r, c)
-                x2, y2 = cell_center_position(r, c+1)
-                wall_x = (x1 + x2) / 2.0
-                wall_y = (y1 + y2) / 2.0
-
-                length = CELL_SIZE  # because it spans from cell c to cell c+1 horizontally
-                # orientation: 90 degrees
-                orientation = 1.5708
-                sdf_parts.append(create_wall(wall_x, wall_y, length, orientation))
-
-    # 2) Add internal horizontal walls
-    # horizontal_walls[r][c] = True => there's a horizontal wall between (r,c) and (r+1,c)
-    for r in range(GRID_SIZE - 1):
-        for c in range(GRID_SIZE):
-            if horizontal_walls[r][c]:
-                # The wall runs horizontally, so orientation = 0
-                x1, y1 = cell_center_position(r, c)
-                x2, y2 = cell_center_position(r+1, c)
-                wall_x = (x1 + x2) / 2.0
-                wall_y = (y1 + y2) / 2.0
-
-                length = CELL_SIZE
-                orientation = 0
-                sdf_parts.append(create_wall(wall_x, wall_y, length, orientation))
+            # If one side is visited and the other is unvisited => remove the wall
+            if visited[a] != visited[b]:
+                new_cell = b if visited[a] else a
+                walls[w] = 0
+                break
+        if new_cell < 0:
+            break
+
+    # Zero-copy views over the wall bytes
+    return wall_arrays(walls, n)
+
+# ==========================
+# Maze algorithm registry
+# ==========================
+# Each entry maps (grid_size, rng) to the maze rows consumed by maze_row_wall_segments
+# (see maze_algorithms.py). Eller's streams rows without ever holding the full grid.
+MAZE_ALGORITHMS = {
+    "prim": lambda grid_size, rng: iter_maze_rows(*generate_prim_maze(grid_size, rng)),
+    "kruskal": lambda grid_size, rng: iter_maze_rows(*generate_kruskal_maze(grid_size, rng)),
+    "backtracker": lambda grid_size, rng: iter_maze_rows(*generate_backtracker_maze(grid_size, rng)),
+    "eller": lambda grid_size, rng: eller_maze_rows(grid_size, grid_size, rng),
+}
+
+# ==========================
+# Merge adjacent collinear walls
+# ==========================
+def collinear_runs(lines):
+    """
+    Find runs of consecutive True entries along each row of a 2D boolean array.
+    Returns (line, start, length) index arrays, one entry per run.
+    """
+    padded = np.zeros((lines.shape[0], lines.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = lines
+    edges = np.diff(padded, axis=1)
+    line, start = np.nonzero(edges == 1)
+    _, end = np.nonzero(edges == -1)
+    return line, start, end - start
+
+# ==========================
+# Convert the wall structures into wall segments
+# ==========================
+def maze_row_wall_segments(rows, grid_size, coalesce=COALESCE_WALLS, cell_size=CELL_SIZE):
+    """
+    Generate (x, y, length, orientation) wall segments from maze rows (see maze_algorithms.py),
+    then the outer bounding walls. Only O(grid_size) state is kept between rows, so this works
+    on streamed rows as well as on full wall arrays.
+    With coalesce=True, runs of adjacent collinear walls are merged into one long wall,
+    which covers exactly the same footprint with far fewer boxes.
+    """
+    # Vertical walls run along the rows, so a run can span many rows:
+    # run_start[c] is the row where the open run of walls between column c and c+1 began, or -1
+    run_start = np.full(max(grid_size - 1, 0), -1)
+
+    def vertical_segments(cols, starts, ends):
+        # The wall runs vertically, so it extends in the y-dim, meaning orientation = 1.5708 (90 deg).
+        # Its center is halfway between column c and c+1, and halfway along the run of rows.
+        run_lengths = ends - starts
+        x1, y1 = cell_center_position(starts + (run_lengths - 1) / 2.0, cols, grid_size, cell_size)
+        x2, _ = cell_center_position(starts, cols + 1, grid_size, cell_size)
+        for wall_x, wall_y, length in zip(((x1 + x2) / 2.0).tolist(), y1.tolist(),
+                                          (run_lengths * cell_size).tolist()):
+            yield wall_x, wall_y, length, 1.5708
+
+    row_count = 0
+    for r, (vertical_row, horizontal_row) in enumerate(rows):
+        row_count = r + 1
+
+        # 1) Add internal vertical walls
+        if coalesce:
+            # Close runs that stop at this row, open runs that start here
+            ended = np.nonzero((run_start >= 0) & ~vertical_row)[0]
+            yield from vertical_segments(ended, run_start[ended], np.full_like(ended, r))
+            run_start[ended] = -1
+            run_start[(run_start < 0) & vertical_row] = r
+        else:
+            cols = np.nonzero(vertical_row)[0]
+            yield from vertical_segments(cols, np.full_like(cols, r), np.full_like(cols, r + 1))
+
+        # 2) Add internal horizontal walls
+        # The wall runs horizontally, so orientation = 0
+        if horizontal_row is None:
+            continue
+        if coalesce:
+            _, cols, run_lengths = collinear_runs(horizontal_row[np.newaxis])
+        else:
+            cols = np.nonzero(horizontal_row)[0]
+            run_lengths = np.ones_like(cols)
+        x1, y1 = cell_center_position(r, cols + (run_lengths - 1) / 2.0, grid_size, cell_size)
+        _, y2 = cell_center_position(r + 1, 0, grid_size, cell_size)
+        wall_y = (y1 + y2) / 2.0
+        for wall_x, length in zip(x1.tolist(), (run_lengths * cell_size).tolist()):
+            yield wall_x, wall_y, length, 0
+
+    # Vertical runs still open after the last row
+    if coalesce:
+        open_cols = np.nonzero(run_start >= 0)[0]
+        yield from vertical_segments(open_cols, run_start[open_cols], np.full_like(open_cols, row_count))
 
     # --------------------------------
     # Finally, add the four bounding walls (same approach as your old code)
     # --------------------------------
-    # Because your total maze width is GRID_SIZE*CELL_SIZE,
-    # the outer walls must be placed at +/- (GRID_SIZE/2)*CELL_SIZE
-    total_width = GRID_SIZE * CELL_SIZE
+    # Because your total maze width is grid_size*cell_size,
+    # the outer walls must be placed at +/- (grid_size/2)*cell_size
+    total_width = grid_size * cell_size
 
     # Bottom wall
-    sdf_parts.append(create_wall(
-        0, -(GRID_SIZE / 2) * CELL_SIZE,
-        total_width, 0
-    ))
+    yield 0, -(grid_size / 2) * cell_size, total_width, 0
     # Top wall
-    sdf_parts.append(create_wall(
-        0, (GRID_SIZE / 2) * CELL_SIZE,
-        total_width, 0
-    ))
+    yield 0, (grid_size / 2) * cell_size, total_width, 0
     # Left wall
-    sdf_parts.append(create_wall(
-        -(GRID_SIZE / 2) * CELL_SIZE, 0,
-        total_width, 1.5708
-    ))
+    yield -(grid_size / 2) * cell_size, 0, total_width, 1.5708
     # Right wall
-    sdf_parts.append(create_wall(
-        (GRID_SIZE / 2) * CELL_SIZE, 0,
-        total_width, 1.5708
-    ))
+    yield (grid_size / 2) * cell_size, 0, total_width, 1.5708
+
+def maze_wall_segments(vertical_walls, horizontal_walls, coalesce=COALESCE_WALLS, cell_size=CELL_SIZE):
+    """
+    Generate (x, y, length, orientation) wall segments from full wall arrays,
+    e.g. those returned by generate_prim_maze.
+    """
+    rows = iter_maze_rows(vertical_walls, horizontal_walls)
+    return maze_row_wall_segments(rows, vertical_walls.shape[0], coalesce, cell_size)
+
+# ==========================
+# Convert the wall segments into SDF
+# ==========================
+def maze_walls_to_sdf(segments, layout=WALL_LAYOUT, thickness=WALL_THICKNESS, height=WALL_HEIGHT):
+    """
+    Generate the SDF snippets of (x, y, length, orientation) wall segments, one at a time,
+    so a whole maze never has to be held in memory as text.
+    Walls are named by index: merged walls can share a center, so position-based names could collide.
+    layout="models" gives every wall its own static model; layout="single" puts every wall
+    into one link of a single static "maze" model, so Gazebo tracks one entity instead of hundreds.
+    """
+    if layout not in ("models", "single"):
+        raise ValueError(f"Unknown wall layout: {layout!r} (expected 'models' or 'single')")
+
+    if layout == "single":
+        yield """
+    <model name="maze">
+      <static>true</static>
+      <link name="link">"""
+        for index, (x, y, length, orientation) in enumerate(segments):
+            yield create_wall_geometry(x, y, length, orientation, f"wall_{index}", thickness, height)
+        yield """
+      </link>
+    </model>
+    """
+        return
 
-    # Join all SDF pieces
-    return "\n".join(sdf_parts)
+    for index, (x, y, length, orientation) in enumerate(segments):
+        if index:
+            yield "\n"
+        yield create_wall(x, y, length, orientation, f"wall_{index}", thickness, height)
+
+# ==========================
+# Atomic file writing
+# ==========================
+def write_atomically(path, chunks, mode="w"):
+    """
+    Stream chunks (text, or bytes with mode="wb") into a temporary file next to path, then rename it into place.
+    Readers (e.g. a launch loading the world) see either the old file or the complete new one,
+    never a truncated one, and nothing is left behind if generation fails part-way.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as file:
+            file.writelines(chunks)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file 0600; give it the usual permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def copy_atomically(source, path, chunk_size=1 << 20):
+    """
+    Copy a file through write_atomically, so path holds either its old contents or the whole copy.
+    """
+    with open(source, "rb") as file:
+        write_atomically(path, iter(lambda: file.read(chunk_size), b""), "wb")
 
 # ==========================
 # Saving Maze to Gazebo World
 # ==========================
-def save_maze_to_world():
-    maze_walls = generate_prim_maze()
+def save_maze_to_world(path="maze_world.world", grid_size=GRID_SIZE, layout=WALL_LAYOUT, seed=None,
+                       cell_size=CELL_SIZE, wall_thickness=WALL_THICKNESS, wall_height=WALL_HEIGHT,
+                       coalesce=COALESCE_WALLS, algorithm=MAZE_ALGORITHM, map_resolution=None,
+                       distance_goals=None, physics=PHYSICS_PROFILE, verbose=True):
+    """
+    Generate a maze and write it as a Gazebo world to path. Returns the number of walls emitted.
+    The same seed and parameters always produce the same world; seed=None uses the global random state.
+    algorithm is any key of MAZE_ALGORITHMS.
+    With map_resolution set (meters per pixel), the walls are also rasterized into a Nav2 occupancy
+    map written next to the world (maze_world.world -> maze_world.pgm + maze_world.yaml).
+    With distance_goals set (a list of (row, col) cells, or "all"), the cell graph and BFS distance
+    tables from those goals are written next to it as well (see write_distance_tables).
+    physics is any key of PHYSICS_PROFILES; "fast" lets gz run the world faster than real time.
+    """
+    if algorithm not in MAZE_ALGORITHMS:
+        raise ValueError(f"Unknown maze algorithm: {algorithm!r} (expected one of {sorted(MAZE_ALGORITHMS)})")
+    footer = WORLD_FOOTER if physics == "default" else with_physics_profile(WORLD_FOOTER, physics)
+    rng = random.Random(seed) if seed is not None else random
 
-    sdf_content = f"""<?xml version="1.0" ?>
-<sdf version="1.6">
-  <world name="prim_maze_world">
+    # 4 bounding walls + one wall per remaining internal cell edge, before any merging
+    edge_walls = 4
+    graph = np.zeros((grid_size, grid_size), dtype=np.uint8) if distance_goals else None
+    def counted_rows():
+        nonlocal edge_walls
+        for r, (vertical_row, horizontal_row) in enumerate(MAZE_ALGORITHMS[algorithm](grid_size, rng)):
+            edge_walls += int(vertical_row.sum()) + (int(horizontal_row.sum()) if horizontal_row is not None else 0)
+            if graph is not None:
+                add_cell_graph_row(graph, r, vertical_row, horizontal_row)
+            yield vertical_row, horizontal_row
 
-    <!-- Plugins -->
-    <plugin filename="gz-sim-physics-system" name="gz::sim::systems::Physics"/>
-    <plugin filename="gz-sim-user-commands-system" name="gz::sim::systems::UserCommands"/>
-    <plugin filename="gz-sim-scene-broadcaster-system" name="gz::sim::systems::SceneBroadcaster"/>
-    <plugin filename="gz-sim-sensors-system" name="gz::sim::systems::Sensors">
-      <render_engine>ogre2</render_engine>
-    </plugin>
-    <plugin filename="gz-sim-imu-system" name="gz::sim::systems::Imu"/>
+    wall_count = 0
+    # Segments are small tuples; they are only kept around when a map has to be rasterized
+    map_segments = [] if map_resolution else None
+    def counted_segments():
+        nonlocal wall_count
+        for segment in maze_row_wall_segments(counted_rows(), grid_size, coalesce, cell_size):
+            wall_count += 1
+            if map_segments is not None:
+                map_segments.append(segment)
+            yield segment
 
-    <!-- Basic Environment (Fuel URIs) -->
-    <include>
-      <uri>https://fuel.gazebosim.org/1.0/OpenRobotics/models/Ground Plane</uri>
-    </include>
-    <include>
-      <uri>https://fuel.gazebosim.org/1.0/OpenRobotics/models/Sun</uri>
-    </include>
+    def world_chunks():
+        yield WORLD_HEADER
+        yield from maze_walls_to_sdf(counted_segments(), layout, wall_thickness, wall_height)
+        yield footer
 
-    <!-- Maze Walls -->
-    {maze_walls}
+    write_atomically(path, world_chunks())
+    if verbose:
+        print(f"Maze saved successfully ({path} overwritten).")
+        print(f"Walls emitted: {wall_count} (from {edge_walls} cell-edge walls)")
+    if map_segments is not None:
+        map_path = write_occupancy_map(os.path.splitext(path)[0], map_segments, wall_thickness,
+                                       write_atomically, map_resolution)
+        if verbose:
+            print(f"Occupancy map saved to {map_path}")
+    if graph is not None:
+        table_path = write_distance_tables(os.path.splitext(path)[0], graph, distance_goals, write_atomically)
+        if verbose:
+            print(f"Distance tables saved to {table_path}")
+    return wall_count
 
-    <!-- Camera Configuration -->
-    <gui fullscreen="0">
-      <camera name="user_camera">
-        <pose>0 0 10 0 1.5708 0</pose>
-        <view_controller>orbit</view_controller>
-      </camera>
-    </gui>
+# ==========================
+# Content-addressed cache of generated worlds
+# ==========================
+def resolve_maze_params(params):
+    """
+    Return params (keyword arguments of save_maze_to_world) with every default filled in, minus
+    path and verbose, so a maze has one key however it is requested and keys follow changed defaults.
+    """
+    bound = inspect.signature(save_maze_to_world).bind_partial(**params)
+    bound.apply_defaults()
+    return {name: value for name, value in bound.arguments.items() if name not in ("path", "verbose")}
 
-    <!-- Physics Configuration -->
-    <physics type="ode">
-      <real_time_update_rate>1000.0</real_time_update_rate>
-      <max_step_size>0.001</max_step_size>
-      <real_time_factor>1</real_time_factor>
-    </physics>
+def maze_cache_key(params):
+    """
+    Hash every generation parameter, defaults included (and CACHE_VERSION), into a short, stable cache key.
+    """
+    params = resolve_maze_params(params)
+    payload = json.dumps({"cache_version": CACHE_VERSION, **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
 
-  </world>
-</sdf>
-"""
-    with open("maze_world.world", "w") as file:
-        file.write(sdf_content)
-    print("Maze saved successfully (maze_world.world overwritten).")
+def cached_maze_world(cache_dir=DEFAULT_CACHE_DIR, force=False, verbose=True, **params):
+    """
+    Return (path, walls, generated) for the world built from params (the keyword arguments of
+    save_maze_to_world, which must include a seed), generating it only if it is not cached yet.
+    A <key>.json file next to each cached world records the parameters it was built from
+    and its wall count.
+    """
+    if params.get("seed") is None:
+        raise ValueError("Cached mazes need an explicit seed to be reproducible")
+    params = resolve_maze_params(params)
+    os.makedirs(cache_dir, exist_ok=True)
+    key = maze_cache_key(params)
+    path = os.path.join(cache_dir, f"maze_{key}.world")
+    metadata_path = os.path.join(cache_dir, f"maze_{key}.json")
+    if os.path.exists(path) and os.path.exists(metadata_path) and not force:
+        with open(metadata_path) as file:
+            return path, json.load(file)["walls"], False
+
+    walls = save_maze_to_world(path, verbose=verbose, **params)
+    write_atomically(metadata_path, [json.dumps({**params, "walls": walls}, indent=2, sort_keys=True)])
+    return path, walls, True
+
+# ==========================
+# Bulk generation across a process pool
+# ==========================
+def _generate_batch_entry(job):
+    """
+    Pool worker: build (or reuse) one cached maze and return its manifest entry.
+    """
+    cache_dir, force, params = job
+    path, walls, _ = cached_maze_world(cache_dir, force, verbose=False, **params)
+    return {"seed": params["seed"], "grid_size": resolve_maze_params(params)["grid_size"], "walls": walls, "path": path}
+
+def generate_maze_batch(count, base_seed, manifest_path, cache_dir=DEFAULT_CACHE_DIR, force=False,
+                        processes=None, **params):
+    """
+    Generate `count` mazes with seeds base_seed .. base_seed+count-1 across a process pool
+    (one seed per task, os.cpu_count() workers by default) and write a JSON manifest listing
+    seed, grid size, wall count and world path for each. Returns the manifest entries.
+    Mazes are independent and go through the cache, so throughput scales with cores and
+    re-running a batch only builds the worlds that are missing.
+    """
+    jobs = [(cache_dir, force, {**params, "seed": base_seed + i}) for i in range(count)]
+    os.makedirs(cache_dir, exist_ok=True)
+    with multiprocessing.Pool(processes) as pool:
+        manifest = list(pool.imap(_generate_batch_entry, jobs, chunksize=max(1, count // 256)))
+
+    write_atomically(manifest_path, [json.dumps(manifest, indent=2)])
+    print(f"{count} mazes (seeds {base_seed}..{base_seed + count - 1}) listed in {manifest_path}")
+    return manifest
 
 # ==========================
 # Generate and Save the Maze
 # ==========================
 if __name__ == "__main__":
-    save_maze_to_world()
+    parser = argparse.ArgumentParser(description="Generate a random maze world for Gazebo.")
+    parser.add_argument("--seed", type=int, help="random seed (default: pick one and print it)")
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE, help="maze size in cells (NxN)")
+    parser.add_argument("--cell-size", type=float, default=CELL_SIZE, help="distance between cells [m]")
+    parser.add_argument("--wall-thickness", type=float, default=WALL_THICKNESS, help="wall thickness [m]")
+    parser.add_argument("--wall-height", type=float, default=WALL_HEIGHT, help="wall height [m]")
+    parser.add_argument("--algorithm", choices=sorted(MAZE_ALGORITHMS), default=MAZE_ALGORITHM,
+                        help="maze generation algorithm")
+    parser.add_argument("--layout", choices=("models", "single"), default=WALL_LAYOUT,
+                        help="one static model per wall, or a single static model holding every wall")
+    parser.add_argument("--no-coalesce", dest="coalesce", action="store_false",
+                        help="emit one wall per cell edge instead of merging collinear walls")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="directory of cached worlds")
+    parser.add_argument("--force", action="store_true", help="regenerate even if the world is cached")
+    parser.add_argument("--output", default="maze_world.world", help="where to copy the world")
+    parser.add_argument("--cache-only", action="store_true", help="only populate the cache, do not copy")
+    parser.add_argument("--map-resolution", type=float, metavar="METERS",
+                        help="also write a Nav2 occupancy map (.pgm + .yaml) next to the world at this resolution")
+    parser.add_argument("--batch", type=int, metavar="N",
+                        help="generate N mazes with seeds --seed .. --seed+N-1 and write a manifest")
+    parser.add_argument("--jobs", type=int, help="worker processes for --batch (default: all cores)")
+    parser.add_argument("--manifest", default="maze_manifest.json", help="manifest path for --batch")
+    parser.add_argument("--distance-goals", type=parse_cell, nargs="+", metavar="ROW,COL",
+                        help="also write the cell graph and BFS distances from these goal cells (.npy)")
+    parser.add_argument("--all-pairs", action="store_true",
+                        help="also write the cell graph and distances between every pair of cells (small grids)")
+    parser.add_argument("--physics", choices=sorted(PHYSICS_PROFILES), default=PHYSICS_PROFILE,
+                        help="physics profile of the world (maze_world.launch.py physics:=... overrides it)")
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2 ** 32)
+    params = dict(grid_size=args.grid_size, algorithm=args.algorithm, layout=args.layout, cell_size=args.cell_size,
+                  wall_thickness=args.wall_thickness, wall_height=args.wall_height, coalesce=args.coalesce,
+                  map_resolution=args.map_resolution, physics=args.physics)
+    if args.all_pairs or args.distance_goals:
+        params["distance_goals"] = "all" if args.all_pairs else [list(goal) for goal in args.distance_goals]
+        try:
+            resolve_goals(params["distance_goals"], args.grid_size)
+        except ValueError as error:
+            parser.error(str(error))
+    if args.batch:
+        generate_maze_batch(args.batch, seed, args.manifest, args.cache_dir, args.force, args.jobs, **params)
+        raise SystemExit(0)
+
+    world_path, _, generated = cached_maze_world(args.cache_dir, args.force, seed=seed, **params)
+    if not generated:
+        print(f"Reusing cached maze: {world_path}")
+    if not args.cache_only:
+        # Every copy goes through a temporary file, so an interrupted copy never leaves a half-written world
+        copy_atomically(world_path, args.output)
+        print(f"Maze copied to {args.output}")
+        if args.map_resolution:
+            copy_occupancy_map(os.path.splitext(world_path)[0], os.path.splitext(args.output)[0], write_atomically)
+            print(f"Occupancy map copied to {os.path.splitext(args.output)[0]}.yaml")
+        if "distance_goals" in params:
+            copy_distance_tables(os.path.splitext(world_path)[0], os.path.splitext(args.output)[0], write_atomically)
+            print(f"Distance tables copied to {os.path.splitext(args.output)[0]}_distances.npy")
+    print(f"Maze seed {seed}: {world_path}")
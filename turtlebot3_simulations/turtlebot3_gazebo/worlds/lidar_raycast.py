@@ -0,0 +1,131 @@
+import math
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from world_geometry import box_footprints, compose_pose, parse_pose, read_wall_boxes
+
+# ==========================
+# Raycast Parameters
+# ==========================
+INDEX_CELL = 1.0     # Side of a spatial index cell [m]
+MIN_DIRECTION = 1e-12 # Ray direction components are kept at least this far from 0 (no 0 * inf)
+
+# ==========================
+# Lidar spec of a robot model
+# ==========================
+def lidar_spec(model_path):
+    """
+    Read the 2D lidar of a model SDF (the turtlebot3 hls_lfcd_lds: a gpu_lidar, or a ray sensor in
+    older models) into a dict: samples, min_angle, max_angle, angle_increment, range_min, range_max,
+    update_rate, noise (gaussian stddev) and pose, its (x, y, yaw) relative to the model.
+    """
+    model = ET.parse(model_path).getroot().find("model")
+    for link in model.findall("link"):
+        for sensor in link.findall("sensor"):
+            if sensor.get("type") not in ("gpu_lidar", "ray"):
+                continue
+            ray = sensor.find("lidar")
+            if ray is None:
+                ray = sensor.find("ray")
+            samples = int(ray.findtext("scan/horizontal/samples"))
+            min_angle = float(ray.findtext("scan/horizontal/min_angle"))
+            max_angle = float(ray.findtext("scan/horizontal/max_angle"))
+            pose = compose_pose(parse_pose(link), parse_pose(sensor))
+            return {
+                "samples": samples,
+                "min_angle": min_angle,
+                "max_angle": max_angle,
+                # Same spacing as gz: both ends of [min_angle, max_angle] are sampled
+                "angle_increment": (max_angle - min_angle) / (samples - 1) if samples > 1 else 0.0,
+                "range_min": float(ray.findtext("range/min")),
+                "range_max": float(ray.findtext("range/max")),
+                "update_rate": float(sensor.findtext("update_rate") or 0.0),
+                "noise": float(ray.findtext("noise/stddev") or 0.0),
+                "pose": pose,
+            }
+    raise ValueError(f"No lidar sensor in {model_path}")
+
+def scan_angles(spec):
+    """
+    Return the beam angles of a lidar spec, relative to the sensor.
+    """
+    return spec["min_angle"] + spec["angle_increment"] * np.arange(spec["samples"])
+
+# ==========================
+# Raycasting against wall boxes
+# ==========================
+class WallRaycaster:
+    """
+    2D raycaster against the axis-aligned footprints of wall boxes (rotated boxes are approximated
+    by their bounding box, as in the occupancy map; maze walls are axis-aligned anyway).
+    A uniform grid of INDEX_CELL cells is the spatial index: each cell keeps the walls that any
+    beam of range_max starting inside it can reach, computed the first time a sensor is in the cell.
+    One cast tests every beam against every candidate in one vectorized slab test. The candidates are
+    bounded by range_max rather than the cell size: with the 3.5 m hls_lfcd_lds, ~100-150 of the
+    1355 walls of a 50x50 maze (0.5 m cells), and 0.25 m index cells would only cut that by ~15%.
+    """
+    def __init__(self, boxes, range_max, cell_size=INDEX_CELL):
+        x_min, x_max, y_min, y_max = box_footprints(np.asarray(boxes, dtype=float).reshape(-1, 5))
+        self.x_min, self.x_max, self.y_min, self.y_max = x_min, x_max, y_min, y_max
+        self.range_max = range_max
+        self.cell_size = cell_size
+        self.cells = {}
+
+    @classmethod
+    def from_world(cls, world_path, range_max, cell_size=INDEX_CELL):
+        """
+        Raycaster against every box collision of a world file (see read_wall_boxes).
+        """
+        return cls(read_wall_boxes(world_path), range_max, cell_size)
+
+    def candidates(self, x, y):
+        """
+        Return the indices of the walls within range_max of any point of the index cell holding (x, y).
+        """
+        key = (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+        walls = self.cells.get(key)
+        if walls is None:
+            # Distance from the cell center to each footprint, against range_max + half the cell diagonal
+            center_x = (key[0] + 0.5) * self.cell_size
+            center_y = (key[1] + 0.5) * self.cell_size
+            dx = np.maximum(np.maximum(self.x_min - center_x, center_x - self.x_max), 0.0)
+            dy = np.maximum(np.maximum(self.y_min - center_y, center_y - self.y_max), 0.0)
+            reach = self.range_max + self.cell_size * math.sqrt(0.5)
+            walls = np.flatnonzero(dx * dx + dy * dy <= reach * reach)
+            self.cells[key] = walls
+        return walls
+
+    def cast(self, x, y, angles):
+        """
+        Return the distance from (x, y) to the first wall along each world-frame angle in `angles`,
+        or inf where no wall is within range_max. A sensor inside a wall reads 0.
+        """
+        walls = self.candidates(x, y)
+        ranges = np.full(len(angles), np.inf)
+        if len(walls) == 0:
+            return ranges
+
+        # Slab test of every beam (rows) against every candidate footprint (columns), in float32:
+        # offsets are taken in float64 first, so precision only matters over range_max
+        dir_x = np.cos(angles)
+        dir_y = np.sin(angles)
+        dir_x[np.abs(dir_x) < MIN_DIRECTION] = MIN_DIRECTION
+        dir_y[np.abs(dir_y) < MIN_DIRECTION] = MIN_DIRECTION
+        inv_x = (1.0 / dir_x).astype(np.float32)[:, None]
+        inv_y = (1.0 / dir_y).astype(np.float32)[:, None]
+        tx1 = (self.x_min[walls] - x).astype(np.float32) * inv_x
+        tx2 = (self.x_max[walls] - x).astype(np.float32) * inv_x
+        ty1 = (self.y_min[walls] - y).astype(np.float32) * inv_y
+        ty2 = (self.y_max[walls] - y).astype(np.float32) * inv_y
+        t_near = np.minimum(tx1, tx2)
+        np.maximum(t_near, np.minimum(ty1, ty2), out=t_near)
+        t_far = np.maximum(tx1, tx2, out=tx2)
+        np.minimum(t_far, np.maximum(ty1, ty2, out=ty2), out=t_far)
+
+        missed = (t_far < t_near) | (t_far < 0.0)
+        np.maximum(t_near, 0.0, out=t_near)
+        t_near[missed] = np.inf
+        ranges[:] = t_near.min(axis=1)
+        ranges[ranges > self.range_max] = np.inf
+        return ranges
@@ -0,0 +1,319 @@
+import argparse
+import math
+import sys
+import time
+import xml.parsers.expat
+
+import numpy as np
+
+from world_geometry import box_footprints, compose_pose
+
+# ==========================
+# Lint Parameters
+# ==========================
+MIN_WALL_SIZE = 1e-6       # Box dimensions at or below this are zero-length walls [m]
+OVERLAP_TOLERANCE = 1e-3   # Walls may overlap by their thickness plus this at junctions [m]
+CONTACT_DEPTH = 0.01       # Boxes sunk less than this into each other only touch, e.g. furniture against a wall [m]
+AXIS_TOLERANCE = 1e-3      # Walls within this of a multiple of 90 degrees are checked for overlaps [rad]
+OVERLAP_CELL = 1.0         # Side of the grid cells walls are bucketed into to find overlapping pairs [m]
+MAX_GRID_CELLS = 1024      # Cells per axis at most (the cell grows for very large worlds)
+LIGHT_MARGIN = 0.5         # Lights may sit this far outside the walls' bounding box [m]
+NETWORK_SCHEMES = ("http://", "https://")  # Include URIs gz sim has to download (Fuel)
+
+# Elements tracked while parsing; names of sibling frames (models, lights, links, ...) must be unique
+TRACKED_TAGS = {"sdf", "world", "model", "include", "actor", "light", "link", "joint", "frame", "collision"}
+FRAME_TAGS = {"model", "include", "actor", "light", "link", "joint", "frame"}
+TEXT_TAGS = {"pose", "size", "uri", "name"}
+# Elements whose name is checked but nothing inside (their start tag is all that is needed)
+NAMED_TAGS = {"visual", "sensor"}
+# Subtrees with nothing to check inside: their elements are left to expat without a Python call
+# per start tag (none of them can contain itself, so the first matching end tag closes the subtree)
+SKIPPED_TAGS = NAMED_TAGS | {"physics", "scene", "gui", "plugin"}
+# What start/end do with each tag, in a single lookup; other tags are only pushed onto the tag stack
+TAG_ROLES = {**{tag: "skipped" for tag in SKIPPED_TAGS}, **{tag: "named" for tag in NAMED_TAGS},
+             **{tag: "tracked" for tag in TRACKED_TAGS}, **{tag: "text" for tag in TEXT_TAGS}}
+
+# ==========================
+# One streaming pass over the file
+# ==========================
+def attribute(attributes, key):
+    """
+    Return the value of an attribute from expat's ordered_attributes list [name, value, name, value, ...].
+    """
+    for index in range(0, len(attributes), 2):
+        if attributes[index] == key:
+            return attributes[index + 1]
+    return None
+
+class _Element:
+    __slots__ = ("tag", "name", "line", "pose", "size", "uri", "light_type", "boxes", "names")
+    # pose is (x, y, z, yaw); boxes are (x, y, z, size_x, size_y, size_z, yaw, scoped name, line)
+
+    def __init__(self, tag, name, line, light_type=None):
+        self.tag = tag
+        self.name = name
+        self.line = line
+        self.light_type = light_type
+        self.pose = self.size = self.uri = None
+        self.boxes = []
+        self.names = {}
+
+class WorldLinter:
+    """
+    Single expat pass over a world (or model.sdf) that keeps only what the checks need: the names
+    of sibling frames, box collisions in world coordinates, world-level lights and include URIs.
+    Nothing else is stored, and every model is reduced to its boxes as soon as it closes, so even
+    worlds with tens of thousands of walls are read in one go with little memory.
+    Poses are composed in 2D (x, y, yaw), like world_geometry.read_wall_boxes, plus height (z);
+    relative_to is ignored and included models are not opened (lint their model.sdf directly).
+    Visuals, plugins and other subtrees without anything to check get no Python call per start tag,
+    and attributes come as flat lists instead of a dict per element.
+    """
+    def __init__(self):
+        self.findings = []
+        self.tags = []
+        self.stack = []
+        self.boxes = []    # (x, y, z, size_x, size_y, size_z, yaw, scoped name, line)
+        self.lights = []   # (x, y, name, line)
+        self.text = None
+        self.parser = None
+        self.skipped = None
+
+    def problem(self, line, severity, message):
+        self.findings.append((line, severity, message))
+
+    def parse(self, path):
+        self.parser = xml.parsers.expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.ordered_attributes = True
+        self.parser.StartElementHandler = self.start
+        self.parser.EndElementHandler = self.end
+        try:
+            with open(path, "rb") as file:
+                self.parser.ParseFile(file)
+        except xml.parsers.expat.ExpatError as error:
+            self.problem(error.lineno, "error", f"malformed XML: {xml.parsers.expat.errors.messages[error.code]}")
+            return False
+        return True
+
+    def start(self, tag, attributes):
+        self.tags.append(tag)
+        role = TAG_ROLES.get(tag)
+        if role is None:
+            return
+        if role == "text":
+            # Text is only collected inside these (no Python call for every run of whitespace)
+            self.text = []
+            self.parser.CharacterDataHandler = self.text.append
+            return
+        if role == "tracked":
+            self.stack.append(_Element(tag, attribute(attributes, "name"), self.parser.CurrentLineNumber,
+                                       (attribute(attributes, "type") or "point") if tag == "light" else None))
+            return
+        if role == "named":
+            name = attribute(attributes, "name")
+            if name is not None and self.stack and self.tags[-2] == self.stack[-1].tag:
+                self.add_name(self.stack[-1], tag, name, self.parser.CurrentLineNumber)
+        self.skipped = tag
+        self.parser.StartElementHandler = None
+        self.parser.EndElementHandler = self.end_skipped
+
+    def end_skipped(self, tag):
+        if tag == self.skipped:
+            self.tags.pop()
+            self.skipped = None
+            self.parser.StartElementHandler = self.start
+            self.parser.EndElementHandler = self.end
+
+    def end(self, tag):
+        self.tags.pop()
+        role = TAG_ROLES.get(tag)
+        if role is None:
+            return
+        if role == "text":
+            self.parser.CharacterDataHandler = None
+            text, self.text = "".join(self.text), None
+            parent = self.tags[-1] if self.tags else None
+            if tag == "pose" and parent in TRACKED_TAGS:
+                self.stack[-1].pose = self.parse_pose(text)
+            elif tag == "size" and parent == "box" and self.tags[-3:-1] == ["collision", "geometry"]:
+                self.stack[-1].size = self.parse_numbers(text, "box size")
+            elif tag == "uri" and parent == "include":
+                self.stack[-1].uri = text.strip()
+            elif tag == "name" and parent == "include":
+                self.stack[-1].name = text.strip()
+            return
+        element = self.stack.pop()
+        parent = self.stack[-1] if self.stack and self.tags and self.tags[-1] == self.stack[-1].tag else None
+        if tag == "collision" and element.size is not None:
+            self.add_box(element)
+        elif tag == "include" and element.uri:
+            if element.name is None:
+                element.name = element.uri.rstrip("/").rsplit("/", 1)[-1]
+            if element.uri.startswith(NETWORK_SCHEMES):
+                self.problem(element.line, "warning",
+                             f"include {element.uri} needs the network (downloaded from Fuel when not cached)")
+        elif tag == "light" and parent is not None and parent.tag == "world" and element.light_type != "directional":
+            x, y, _, _ = element.pose or (0.0, 0.0, 0.0, 0.0)
+            self.lights.append((x, y, element.name, element.line))
+
+        if element.boxes and parent is not None:
+            # Boxes are kept relative to their element until it closes (its <pose> may come last)
+            if element.pose is None:
+                parent.boxes.extend(element.boxes)
+            else:
+                pose, z = (element.pose[0], element.pose[1], element.pose[3]), element.pose[2]
+                for x, y, box_z, size_x, size_y, size_z, yaw, name, line in element.boxes:
+                    x, y, yaw = compose_pose(pose, (x, y, yaw))
+                    parent.boxes.append((x, y, z + box_z, size_x, size_y, size_z, yaw, name, line))
+        elif element.boxes:
+            self.boxes.extend(element.boxes)
+
+        if parent is not None and element.name is not None:
+            self.add_name(parent, tag, element.name, element.line)
+
+    def add_name(self, parent, tag, name, line):
+        key = ("frame" if tag in FRAME_TAGS else tag, name)
+        if key in parent.names:
+            self.problem(line, "error", f"duplicate {tag} name {name!r} (first used on line {parent.names[key]})")
+        else:
+            parent.names[key] = line
+
+    def add_box(self, collision):
+        size = collision.size
+        scoped = "::".join(element.name or element.tag for element in self.stack + [collision]
+                           if element.tag not in ("sdf", "world"))
+        if len(size) < 3:
+            self.problem(collision.line, "error", f"box size of {scoped} needs 3 values")
+            return
+        if min(size) <= MIN_WALL_SIZE:
+            self.problem(collision.line, "error", f"zero-length wall {scoped} (size {' '.join(map(str, size))})")
+            return
+        x, y, z, yaw = collision.pose or (0.0, 0.0, 0.0, 0.0)
+        self.stack[-1].boxes.append((x, y, z, size[0], size[1], size[2], yaw, scoped, collision.line))
+
+    def parse_numbers(self, text, what):
+        try:
+            return [float(value) for value in text.split()]
+        except ValueError:
+            self.problem(self.parser.CurrentLineNumber, "error", f"{what} is not numeric: {text.strip()!r}")
+            return None
+
+    def parse_pose(self, text):
+        values = self.parse_numbers(text, "pose")
+        if values is None:
+            return None
+        if len(values) not in (0, 6, 7):
+            self.problem(self.parser.CurrentLineNumber, "error", f"pose needs 6 values: {text.strip()!r}")
+        values += [0.0] * (6 - len(values))
+        return values[0], values[1], values[2], values[5]
+
+# ==========================
+# Checks over the collected walls and lights
+# ==========================
+def candidate_pairs(x_min, x_max, y_min, y_max, cell_size=OVERLAP_CELL):
+    """
+    Return the index pairs (i, j), i < j, of footprints sharing a cell of a uniform grid, as two arrays.
+    Every footprint is entered into each cell it covers, so only nearby walls are paired up and the
+    work stays linear in the number of walls of a maze.
+    """
+    count = len(x_min)
+    if count < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    extent = max(x_max.max() - x_min.min(), y_max.max() - y_min.min())
+    cell_size = max(cell_size, extent / MAX_GRID_CELLS)
+    col_min = np.floor(x_min / cell_size).astype(np.int64)
+    row_min = np.floor(y_min / cell_size).astype(np.int64)
+    width = np.floor(x_max / cell_size).astype(np.int64) - col_min + 1
+    cells = width * (np.floor(y_max / cell_size).astype(np.int64) - row_min + 1)
+
+    # One entry per (wall, covered cell)
+    wall = np.repeat(np.arange(count), cells)
+    offset = np.arange(len(wall)) - np.repeat(np.cumsum(cells) - cells, cells)
+    col = col_min[wall] + offset % width[wall]
+    row = row_min[wall] + offset // width[wall]
+    cell = (col - col.min()) * (row.max() - row.min() + 1) + (row - row.min())
+    order = np.argsort(cell, kind="stable")
+    cell, wall, col, row = cell[order], wall[order], col[order], row[order]
+
+    # Each entry pairs with the entries after it in the same cell
+    partners = np.searchsorted(cell, cell, side="right") - np.arange(len(cell)) - 1
+    first = np.repeat(np.arange(len(cell)), partners)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(partners) - partners, partners)
+    a, b = wall[first], wall[second]
+
+    # Walls sharing several cells are paired once, in the first cell of their common ones
+    once = (np.maximum(col_min[a], col_min[b]) == col[first]) & (np.maximum(row_min[a], row_min[b]) == row[first])
+    a, b = a[once], b[once]
+    return np.minimum(a, b), np.maximum(a, b)
+
+def overlapping_walls(walls):
+    """
+    Return (i, j, overlap length) for walls (rows of x, y, z, size_x, size_y, size_z, yaw) overlapping
+    by more than a junction would. Where boxes meet or cross (maze walls at a corner, a shelf against
+    the back of a bookshelf), the shared volume is at most as thick as the thicker box along two of
+    the three axes; more than that along two axes means boxes stacked along the same line or face
+    (or a duplicate). Boxes one above the other (shelves, the wall over a door) do not share any
+    height, and boxes sunk less than CONTACT_DEPTH into each other only touch, so neither overlaps.
+    Only axis-aligned walls are checked, as their footprints are exact.
+    """
+    quarter = np.mod(walls[:, 6], math.pi / 2)
+    aligned = np.flatnonzero(np.minimum(quarter, math.pi / 2 - quarter) <= AXIS_TOLERANCE)
+    if len(aligned) < 2:
+        return []
+    walls = walls[aligned]
+    x_min, x_max, y_min, y_max = box_footprints(walls[:, [0, 1, 3, 4, 6]])
+    z_min, z_max = walls[:, 2] - walls[:, 5] / 2, walls[:, 2] + walls[:, 5] / 2
+    i, j = candidate_pairs(x_min, x_max, y_min, y_max)
+    overlaps = np.stack([np.minimum(x_max[i], x_max[j]) - np.maximum(x_min[i], x_min[j]),
+                         np.minimum(y_max[i], y_max[j]) - np.maximum(y_min[i], y_min[j]),
+                         np.minimum(z_max[i], z_max[j]) - np.maximum(z_min[i], z_min[j])])
+    thickness = np.minimum(np.minimum(x_max - x_min, y_max - y_min), walls[:, 5])
+    thicker = np.maximum(thickness[i], thickness[j]) + OVERLAP_TOLERANCE
+    stacked = ((overlaps > CONTACT_DEPTH).all(axis=0)
+               & ((overlaps > thicker).sum(axis=0) >= 2))
+    length = overlaps[:2].max(axis=0)
+    return [(int(aligned[a]), int(aligned[b]), float(length))
+            for a, b, length in zip(i[stacked], j[stacked], length[stacked])]
+
+def lint_world(path):
+    """
+    Check a world file and return its problems as (line, severity, message), sorted by line:
+    errors for malformed XML, duplicate sibling names (models, lights, links, collisions, ...),
+    zero-length and overlapping walls; warnings for point and spot lights outside the walls'
+    bounding box (plus LIGHT_MARGIN) and includes that have to be downloaded.
+    """
+    linter = WorldLinter()
+    if linter.parse(path):
+        boxes = linter.boxes
+        walls = np.array([box[:7] for box in boxes], dtype=float).reshape(-1, 7)
+        for a, b, length in overlapping_walls(walls):
+            linter.problem(boxes[b][8], "error",
+                           f"wall {boxes[b][7]} overlaps {boxes[a][7]} (line {boxes[a][8]}) by {length:.3f} m")
+        if boxes and linter.lights:
+            x_min, x_max, y_min, y_max = box_footprints(walls[:, [0, 1, 3, 4, 6]])
+            bounds = (x_min.min() - LIGHT_MARGIN, x_max.max() + LIGHT_MARGIN,
+                      y_min.min() - LIGHT_MARGIN, y_max.max() + LIGHT_MARGIN)
+            for x, y, name, line in linter.lights:
+                if not (bounds[0] <= x <= bounds[1] and bounds[2] <= y <= bounds[3]):
+                    linter.problem(line, "warning", f"light {name} at ({x:.2f}, {y:.2f}) is outside the walls "
+                                                    f"({bounds[0]:.2f}..{bounds[1]:.2f}, {bounds[2]:.2f}..{bounds[3]:.2f})")
+    return sorted(linter.findings, key=lambda finding: finding[0])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check Gazebo world files for problems before starting a simulation.")
+    parser.add_argument("worlds", nargs="+", help="world (or model.sdf) files to check")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    args = parser.parse_args()
+
+    failed = False
+    for world in args.worlds:
+        start = time.perf_counter()
+        findings = lint_world(world)
+        elapsed = time.perf_counter() - start
+        for line, severity, message in findings:
+            print(f"{world}:{line}: {severity}: {message}")
+        errors = sum(severity == "error" for _, severity, _ in findings)
+        print(f"{world}: {errors} errors, {len(findings) - errors} warnings ({elapsed * 1e3:.1f} ms)")
+        failed = failed or errors > 0 or (args.strict and len(findings) > 0)
+    sys.exit(1 if failed else 0)
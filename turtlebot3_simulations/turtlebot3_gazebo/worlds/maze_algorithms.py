@@ -0,0 +1,189 @@
+import itertools
+import random
+
+import numpy as np
+
+# ==========================
+# Maze algorithm interface
+# ==========================
+# Every algorithm takes (grid_size, rng) and produces the maze row by row as
+# (vertical_row, horizontal_row) boolean arrays, top row first:
+# - vertical_row[c] = True means there's a wall between (r,c) and (r,c+1)
+# - horizontal_row[c] = True means there's a wall between (r,c) and (r+1,c); None on the last row
+# Algorithms that need the whole grid build vertical_walls/horizontal_walls arrays (same layout
+# as generate_prim_maze) and hand them to iter_maze_rows; Eller's builds one row at a time
+# (eller_maze_rows takes width and rows separately, so it also streams non-square or unbounded mazes).
+# Wall ids follow generate_prim_maze: vertical wall between (r,c) and (r,c+1) is r*(n-1) + c,
+# horizontal wall between (r,c) and (r+1,c) is n*(n-1) + r*n + c.
+
+def iter_maze_rows(vertical_walls, horizontal_walls):
+    """
+    Yield (vertical_row, horizontal_row) for every row of full wall arrays.
+    """
+    last_row = vertical_walls.shape[0] - 1
+    for r in range(last_row + 1):
+        yield vertical_walls[r], (horizontal_walls[r] if r < last_row else None)
+
+def wall_arrays(walls, grid_size):
+    """
+    Zero-copy views of a flat wall bytearray as (vertical_walls, horizontal_walls).
+    """
+    n = grid_size
+    num_vertical = n * (n - 1)
+    vertical_walls = np.frombuffer(walls, dtype=np.bool_, count=num_vertical).reshape(n, n - 1)
+    horizontal_walls = np.frombuffer(walls, dtype=np.bool_, offset=num_vertical).reshape(n - 1, n)
+    return vertical_walls, horizontal_walls
+
+# ==========================
+# Kruskal's (union-find)
+# ==========================
+def generate_kruskal_maze(grid_size, rng=random):
+    """
+    Kruskal's algorithm: visit every wall in random order and remove it if the cells on
+    either side are not connected yet. Connectivity is tracked with a union-find over
+    cells using path halving and union by size, so each wall costs near O(1).
+    Returns (vertical_walls, horizontal_walls).
+    """
+    n = grid_size
+    num_vertical = n * (n - 1)
+    num_walls = num_vertical + (n - 1) * n
+
+    walls = bytearray(b"\x01") * num_walls
+    parent = list(range(n * n))
+    size = [1] * (n * n)
+
+    order = list(range(num_walls))
+    rng.shuffle(order)
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    remaining = n * n - 1
+    for w in order:
+        if not remaining:
+            break
+        # Wall is between cells a and b
+        if w < num_vertical:
+            a = w + w // (n - 1)
+            b = a + 1
+        else:
+            a = w - num_vertical
+            b = a + n
+
+        root_a = find(a)
+        root_b = find(b)
+        if root_a != root_b:
+            if size[root_a] < size[root_b]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+            size[root_a] += size[root_b]
+            walls[w] = 0
+            remaining -= 1
+
+    return wall_arrays(walls, n)
+
+# ==========================
+# Recursive backtracker (iterative)
+# ==========================
+def generate_backtracker_maze(grid_size, rng=random):
+    """
+    Depth-first "recursive backtracker", run with an explicit stack so large grids
+    cannot hit the recursion limit. Produces long, winding corridors.
+    Returns (vertical_walls, horizontal_walls).
+    """
+    n = grid_size
+    num_vertical = n * (n - 1)
+    num_walls = num_vertical + (n - 1) * n
+
+    visited = bytearray(n * n)
+    walls = bytearray(b"\x01") * num_walls
+
+    start = rng.randrange(n * n)
+    visited[start] = 1
+    stack = [start]
+    while stack:
+        cell = stack[-1]
+        r, c = divmod(cell, n)
+
+        # (neighbor, wall between cell and neighbor) for every unvisited neighbor
+        options = []
+        if c + 1 < n and not visited[cell + 1]:
+            options.append((cell + 1, r * (n - 1) + c))
+        if c > 0 and not visited[cell - 1]:
+            options.append((cell - 1, r * (n - 1) + c - 1))
+        if r + 1 < n and not visited[cell + n]:
+            options.append((cell + n, num_vertical + cell))
+        if r > 0 and not visited[cell - n]:
+            options.append((cell - n, num_vertical + cell - n))
+
+        if not options:
+            stack.pop()
+            continue
+        neighbor, w = options[rng.randrange(len(options))]
+        walls[w] = 0
+        visited[neighbor] = 1
+        stack.append(neighbor)
+
+    return wall_arrays(walls, n)
+
+# ==========================
+# Eller's (row by row, O(width) memory)
+# ==========================
+def eller_maze_rows(width, rows=None, rng=random):
+    """
+    Eller's algorithm: build the maze one row at a time, keeping only the set label of
+    each cell in the current row, so arbitrarily large mazes stream in O(width) memory.
+    - Randomly join adjacent cells of different sets (always on the last row).
+    - Carve at least one passage down from every set; cells below a carved passage keep its set.
+    Sets are merged smaller-into-larger so each row costs O(width log width).
+    Yields `rows` rows of (vertical_row, horizontal_row) like iter_maze_rows, the last one closing
+    the maze; with rows=None the maze is unbounded and rows are yielded for as long as they are consumed.
+    """
+    n = width
+    row_sets = list(range(n))
+    members = {c: [c] for c in range(n)}
+    next_label = n
+
+    for r in itertools.count() if rows is None else range(rows):
+        last_row = rows is not None and r == rows - 1
+
+        # Join adjacent cells of different sets
+        vertical_row = np.ones(n - 1, dtype=np.bool_)
+        for c in range(n - 1):
+            a, b = row_sets[c], row_sets[c + 1]
+            if a != b and (last_row or rng.random() < 0.5):
+                vertical_row[c] = False
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for cell in members[b]:
+                    row_sets[cell] = a
+                members[a].extend(members.pop(b))
+
+        if last_row:
+            yield vertical_row, None
+            return
+
+        # Carve passages down: at least one per set
+        horizontal_row = np.ones(n, dtype=np.bool_)
+        next_sets = [-1] * n
+        for label, cells in members.items():
+            carved = [c for c in cells if rng.random() < 0.5]
+            if not carved:
+                carved = [cells[rng.randrange(len(cells))]]
+            for c in carved:
+                horizontal_row[c] = False
+                next_sets[c] = label
+
+        # Cells without a passage from above start a new set
+        members = {}
+        for c in range(n):
+            if next_sets[c] < 0:
+                next_sets[c] = next_label
+                next_label += 1
+            members.setdefault(next_sets[c], []).append(c)
+        row_sets = next_sets
+
+        yield vertical_row, horizontal_row
@@ -0,0 +1,128 @@
+import io
+
+import numpy as np
+
+# ==========================
+# Cell graph
+# ==========================
+# The cell graph is an (n, n) uint8 array indexed [row, col] like cell_center_position,
+# holding a bitmask of the directions a robot can move out of each cell.
+OPEN_EAST = 1   # to (r, c+1)
+OPEN_WEST = 2   # to (r, c-1)
+OPEN_NORTH = 4  # to (r+1, c)
+OPEN_SOUTH = 8  # to (r-1, c)
+ALL_PAIRS_MAX_CELLS = 1024  # All-pairs tables grow with cells^2; beyond this, pick goals instead
+COPY_CHUNK_SIZE = 1 << 20   # Bytes read at a time when copying tables
+
+def add_cell_graph_row(graph, r, vertical_row, horizontal_row):
+    """
+    Fill in row r of a cell graph from one maze row (see maze_algorithms.py), so the graph
+    can be built while the rows stream by.
+    """
+    n = graph.shape[0]
+    passages = ~np.asarray(vertical_row, dtype=np.bool_)
+    graph[r, :n - 1] |= passages * np.uint8(OPEN_EAST)
+    graph[r, 1:] |= passages * np.uint8(OPEN_WEST)
+    if horizontal_row is not None:
+        passages = ~np.asarray(horizontal_row, dtype=np.bool_)
+        graph[r] |= passages * np.uint8(OPEN_NORTH)
+        graph[r + 1] |= passages * np.uint8(OPEN_SOUTH)
+
+def cell_graph(vertical_walls, horizontal_walls):
+    """
+    Build the cell graph of full wall arrays, e.g. those returned by generate_prim_maze.
+    """
+    n = vertical_walls.shape[0]
+    graph = np.zeros((n, n), dtype=np.uint8)
+    for r in range(n):
+        add_cell_graph_row(graph, r, vertical_walls[r], horizontal_walls[r] if r < n - 1 else None)
+    return graph
+
+# ==========================
+# Breadth-first distance tables
+# ==========================
+def parse_cell(text):
+    """
+    Parse a "row,col" command-line argument into a (row, col) tuple.
+    """
+    row, col = text.split(",")
+    return int(row), int(col)
+
+def resolve_goals(goals, grid_size):
+    """
+    Return goals as a checked list of (row, col) cells. goals="all" means every cell,
+    in row-major order (goal index r * n + c), for grids of up to ALL_PAIRS_MAX_CELLS cells.
+    """
+    n = grid_size
+    if goals == "all":
+        if n * n > ALL_PAIRS_MAX_CELLS:
+            raise ValueError(f"All-pairs distances are limited to {ALL_PAIRS_MAX_CELLS} cells "
+                             f"({n}x{n} has {n * n}); pass explicit goals instead")
+        goals = [divmod(cell, n) for cell in range(n * n)]
+    for r, c in goals:
+        if not (0 <= r < n and 0 <= c < n):
+            raise ValueError(f"Goal cell {(r, c)} is outside the {n}x{n} maze")
+    return [(r, c) for r, c in goals]
+
+def bfs_distances(graph, goals):
+    """
+    Return an int32 (len(goals), n, n) array: distances[k, r, c] is the length, in cells, of the
+    shortest path from goals[k] to cell (r, c), or -1 if it cannot be reached.
+    goals is a list of (row, col) cells or "all" (see resolve_goals).
+    """
+    n = graph.shape[0]
+    goals = resolve_goals(goals, n)
+    open_directions = graph.ravel().tolist()
+    steps = ((OPEN_EAST, 1), (OPEN_WEST, -1), (OPEN_NORTH, n), (OPEN_SOUTH, -n))
+    distances = np.empty((len(goals), n * n), dtype=np.int32)
+    for k, (r, c) in enumerate(goals):
+        distance = [-1] * (n * n)
+        start = r * n + c
+        distance[start] = 0
+        queue = [start]
+        # The queue only grows at its end, so iterating it while appending visits cells in BFS order
+        for cell in queue:
+            next_distance = distance[cell] + 1
+            directions = open_directions[cell]
+            for direction, step in steps:
+                if directions & direction and distance[cell + step] < 0:
+                    distance[cell + step] = next_distance
+                    queue.append(cell + step)
+        distances[k] = distance
+    return distances.reshape(len(goals), n, n)
+
+# ==========================
+# Memory-mappable table files
+# ==========================
+TABLE_SUFFIXES = ("_cells.npy", "_goals.npy", "_distances.npy")
+
+def npy_bytes(array):
+    """
+    Return the .npy file contents of an array.
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+def write_distance_tables(stem, graph, goals, write):
+    """
+    Write <stem>_cells.npy (cell graph), <stem>_goals.npy ((k, 2) goal cells) and
+    <stem>_distances.npy (bfs_distances). Open them with np.load(path, mmap_mode="r") for
+    O(1) lookups without reading the whole table. Files are written through
+    write(path, chunks, mode) (e.g. generate_maze.write_atomically). Returns the distances path.
+    """
+    goals = resolve_goals(goals, graph.shape[0])
+    distances = bfs_distances(graph, goals)
+    goal_array = np.array(goals, dtype=np.int32).reshape(-1, 2)
+    for suffix, array in zip(TABLE_SUFFIXES, (graph, goal_array, distances)):
+        write(f"{stem}{suffix}", [npy_bytes(array)], "wb")
+    return f"{stem}_distances.npy"
+
+def copy_distance_tables(source_stem, target_stem, write):
+    """
+    Copy the table files of source_stem to target_stem, streamed in COPY_CHUNK_SIZE blocks.
+    Files are written through write(path, chunks, mode), as in write_distance_tables.
+    """
+    for suffix in TABLE_SUFFIXES:
+        with open(f"{source_stem}{suffix}", "rb") as file:
+            write(f"{target_stem}{suffix}", iter(lambda: file.read(COPY_CHUNK_SIZE), b""), "wb")
@@ -0,0 +1,104 @@
+import math
+import os
+
+import numpy as np
+
+# ==========================
+# Occupancy Map Parameters
+# ==========================
+MAP_RESOLUTION = 0.05   # Meters per pixel (Nav2 / SLAM default)
+MAP_FREE = 254          # PGM value of free space
+MAP_OCCUPIED = 0        # PGM value of occupied space
+EPSILON = 1e-9          # Keeps wall edges that land exactly on pixel borders from spilling over
+
+# ==========================
+# Rasterize wall segments
+# ==========================
+def wall_footprints(segments, thickness):
+    """
+    Return the axis-aligned footprint (x_min, x_max, y_min, y_max) of (x, y, length, orientation)
+    wall segments as four arrays. Walls run along x (orientation 0) or along y (orientation 1.5708).
+    """
+    x, y, length, orientation = np.asarray(segments, dtype=float).reshape(-1, 4).T
+    along_y = np.abs(np.sin(orientation)) > 0.5
+    half_x = np.where(along_y, thickness / 2.0, length / 2.0)
+    half_y = np.where(along_y, length / 2.0, thickness / 2.0)
+    return x - half_x, x + half_x, y - half_y, y + half_y
+
+def rasterize_footprints(x_min, x_max, y_min, y_max, resolution=MAP_RESOLUTION, origin=None, shape=None):
+    """
+    Rasterize axis-aligned footprints (four arrays, e.g. from wall_footprints or
+    world_geometry.box_footprints) into an occupancy grid. By default the grid covers exactly
+    the footprints' extents; pass origin and (height, width) shape to rasterize onto another grid.
+    Returns (occupied, origin): occupied[row, col] is True for every pixel a footprint overlaps,
+    row 0 at the bottom (y = origin[1]), and origin is the world (x, y) of the bottom-left corner.
+    All footprints are painted at once: +1/-1 at the corners of each one's pixel rectangle, then
+    a 2D cumulative sum gives the number of footprints covering every pixel.
+    """
+    if origin is None:
+        origin = (float(x_min.min()), float(y_min.min()))
+    if shape is None:
+        shape = (max(1, math.ceil((y_max.max() - origin[1]) / resolution - EPSILON)),
+                 max(1, math.ceil((x_max.max() - origin[0]) / resolution - EPSILON)))
+    height, width = shape
+
+    col_start = np.clip(np.floor((x_min - origin[0]) / resolution + EPSILON), 0, width).astype(np.intp)
+    col_end = np.clip(np.ceil((x_max - origin[0]) / resolution - EPSILON), 0, width).astype(np.intp)
+    row_start = np.clip(np.floor((y_min - origin[1]) / resolution + EPSILON), 0, height).astype(np.intp)
+    row_end = np.clip(np.ceil((y_max - origin[1]) / resolution - EPSILON), 0, height).astype(np.intp)
+
+    corners = np.zeros((height + 1, width + 1), dtype=np.int16)
+    np.add.at(corners, (row_start, col_start), 1)
+    np.add.at(corners, (row_start, col_end), -1)
+    np.add.at(corners, (row_end, col_start), -1)
+    np.add.at(corners, (row_end, col_end), 1)
+    coverage = corners.cumsum(axis=0, dtype=np.int16).cumsum(axis=1, dtype=np.int16)
+    return coverage[:height, :width] > 0, origin
+
+def rasterize_walls(segments, thickness, resolution=MAP_RESOLUTION):
+    """
+    Rasterize (x, y, length, orientation) wall segments into an occupancy grid covering exactly
+    the walls' extents. Returns (occupied, origin), see rasterize_footprints.
+    """
+    return rasterize_footprints(*wall_footprints(segments, thickness), resolution)
+
+# ==========================
+# Nav2 map files (PGM + YAML)
+# ==========================
+def map_yaml(image_name, resolution, origin):
+    """
+    Return the text of a Nav2 map YAML file for a trinary PGM image.
+    """
+    return (f"image: {image_name}\n"
+            f"mode: trinary\n"
+            f"resolution: {resolution}\n"
+            f"origin: [{origin[0]:.6f}, {origin[1]:.6f}, 0.0]\n"
+            f"negate: 0\n"
+            f"occupied_thresh: 0.65\n"
+            f"free_thresh: 0.25\n")
+
+def write_occupancy_map(stem, segments, thickness, write, resolution=MAP_RESOLUTION):
+    """
+    Rasterize wall segments and write <stem>.pgm and <stem>.yaml, a map Nav2's map_server
+    can load directly, through write(path, chunks, mode) (e.g. generate_maze.write_atomically).
+    Returns the YAML path.
+    """
+    occupied, origin = rasterize_walls(segments, thickness, resolution)
+    image = np.where(occupied, MAP_OCCUPIED, MAP_FREE).astype(np.uint8)
+    height, width = image.shape
+    # PGM rows run top to bottom, the grid's run bottom to top
+    write(f"{stem}.pgm", [f"P5\n{width} {height}\n255\n".encode("ascii"), image[::-1].tobytes()], "wb")
+    write(f"{stem}.yaml", [map_yaml(os.path.basename(f"{stem}.pgm"), resolution, origin)])
+    return f"{stem}.yaml"
+
+def copy_occupancy_map(source_stem, target_stem, write):
+    """
+    Copy <source_stem>.pgm/.yaml to <target_stem>.pgm/.yaml, pointing the YAML at the new image.
+    Files are written through write(path, chunks, mode), as in write_occupancy_map.
+    """
+    with open(f"{source_stem}.pgm", "rb") as file:
+        write(f"{target_stem}.pgm", [file.read()], "wb")
+    with open(f"{source_stem}.yaml") as file:
+        lines = file.readlines()
+    image_name = os.path.basename(f"{target_stem}.pgm")
+    write(f"{target_stem}.yaml", [f"image: {image_name}\n" if line.startswith("image:") else line for line in lines])
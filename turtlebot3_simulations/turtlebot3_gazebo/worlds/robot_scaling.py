@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import shutil
+import time
+
+from generate_maze import DEFAULT_CACHE_DIR, GRID_SIZE, cached_maze_world, cell_center_position
+from physics_profiles import PHYSICS_PROFILES
+from run_parallel_sims import SimInstance
+
+# ==========================
+# Scaling Parameters
+# ==========================
+ROBOT_COUNTS = [1, 2, 4, 8]  # Robots per world to measure
+WARMUP = 30.0       # Wall seconds for gz to start and every robot to spawn before measuring
+DURATION = 30.0     # Wall seconds of real time factor measurement
+
+# ==========================
+# Measure one robot count
+# ==========================
+def measure_rtf(count, world, x_pose, y_pose, log_dir, physics=None, warmup=WARMUP, duration=DURATION):
+    """
+    Launch the world headless with robots:=<count> and return its real time factor (sim seconds per
+    wall second) over `duration` seconds after `warmup`, or None if gz never published its clock.
+    """
+    run_dir = os.path.join(log_dir, f"robots_{count}")
+    os.makedirs(run_dir, exist_ok=True)
+    instance = SimInstance(0, world, x_pose, y_pose, run_dir, physics=physics, robots=count)
+    instance.start()
+    try:
+        time.sleep(warmup)
+        start_sim = instance.sim_time()
+        start_wall = time.time()
+        time.sleep(duration)
+        end_sim = instance.sim_time()
+        end_wall = time.time()
+    finally:
+        instance.stop()
+    if start_sim is None or end_sim is None:
+        return None
+    return (end_sim - start_sim) / (end_wall - start_wall)
+
+def measure_scaling(counts, world, x_pose, y_pose, log_dir, physics=None, warmup=WARMUP, duration=DURATION):
+    """
+    Measure every robot count in turn and print the real time factor and the robot-seconds simulated
+    per wall second (robots x RTF), the throughput one world gives a multi-robot test.
+    """
+    rows = []
+    for count in counts:
+        rtf = measure_rtf(count, world, x_pose, y_pose, log_dir, physics, warmup, duration)
+        rows.append({"robots": count, "rtf": rtf})
+        print(f"{count} robots: RTF {'n/a (no clock)' if rtf is None else f'{rtf:.2f}'}")
+
+    print(f"\n{'robots':>7}{'RTF':>8}{'robot-s per wall-s':>21}")
+    for row in rows:
+        if row["rtf"] is None:
+            print(f"{row['robots']:>7}{'n/a':>8}{'n/a':>21}")
+        else:
+            print(f"{row['robots']:>7}{row['rtf']:>8.2f}{row['robots'] * row['rtf']:>21.2f}")
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure sim real time factor as the robot count in one world grows.")
+    parser.add_argument("--counts", type=int, nargs="+", default=ROBOT_COUNTS, help="robot counts to measure")
+    parser.add_argument("--world", help="world file (default: a generated maze, see --seed / --grid-size)")
+    parser.add_argument("--seed", type=int, default=0, help="maze seed")
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE, help="maze size")
+    parser.add_argument("--x-pose", type=float, help="first robot x (default: a cell center of the maze)")
+    parser.add_argument("--y-pose", type=float, help="first robot y (default: a cell center of the maze)")
+    parser.add_argument("--physics", choices=sorted(PHYSICS_PROFILES), help="physics profile to run with")
+    parser.add_argument("--warmup", type=float, default=WARMUP, help="wall seconds before measuring")
+    parser.add_argument("--duration", type=float, default=DURATION, help="wall seconds to measure for")
+    parser.add_argument("--log-dir", default="robot_scaling", help="launch logs, one directory per count")
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    for tool in ("ros2", "gz"):
+        if shutil.which(tool) is None:
+            parser.error(f"`{tool}` was not found on PATH; source your ROS 2 / Gazebo installation first")
+    if "TURTLEBOT3_MODEL" not in os.environ:
+        parser.error("set TURTLEBOT3_MODEL (e.g. burger) first")
+
+    if args.world:
+        world = os.path.abspath(args.world)
+        x_pose, y_pose = 0.0, 0.0
+    else:
+        world, _, _ = cached_maze_world(DEFAULT_CACHE_DIR, seed=args.seed, grid_size=args.grid_size, verbose=False)
+        # Robots spawn one cell apart along x, starting from the first cell of the middle row
+        x_pose, y_pose = cell_center_position(args.grid_size // 2, 0, args.grid_size)
+    x_pose = args.x_pose if args.x_pose is not None else x_pose
+    y_pose = args.y_pose if args.y_pose is not None else y_pose
+
+    rows = measure_scaling(args.counts, world, x_pose, y_pose, args.log_dir, args.physics, args.warmup, args.duration)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(rows, file, indent=2)
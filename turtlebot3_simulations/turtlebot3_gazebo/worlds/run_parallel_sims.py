@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+import argparse
+import itertools
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import time
+
+from generate_maze import DEFAULT_CACHE_DIR, GRID_SIZE, cached_maze_world, cell_center_position
+from physics_profiles import PHYSICS_PROFILES
+
+# ==========================
+# Parallel Run Parameters
+# ==========================
+LAUNCH_FILE = "maze_world.launch.py"
+DOMAIN_ID_BASE = 10     # Instance i uses ROS_DOMAIN_ID DOMAIN_ID_BASE + i
+MAX_DOMAIN_ID = 101     # Highest ROS_DOMAIN_ID that is safe on every platform
+POLL_PERIOD = 5.0       # Seconds between health checks
+CLOCK_TIMEOUT = 5.0     # Seconds to wait for one gz /clock message
+STALL_POLLS = 3         # Polls without sim time progress before an instance counts as stalled
+SHUTDOWN_TIMEOUT = 30.0 # Seconds to wait for an instance to exit after SIGINT
+
+# Simulation time of a gz.msgs.Clock message printed by `gz topic -e`
+SIM_CLOCK = re.compile(r"sim\s*\{([^}]*)\}")
+
+# ==========================
+# One isolated simulation
+# ==========================
+class SimInstance:
+    """
+    One `ros2 launch` of the maze world in its own Gazebo partition and ROS domain, so its clock,
+    odom, scan and cmd_vel never mix with another instance's. Health comes from the instance's
+    gz /clock: "starting" until the first sim time is seen, then "running" while sim time advances,
+    "stalled" after STALL_POLLS polls without progress, or "exited (<code>)".
+    """
+    def __init__(self, index, world, x_pose, y_pose, log_dir, headless=True, label=None, physics=None,
+                 robots=None):
+        self.index = index
+        self.world = world
+        self.label = label or os.path.basename(world)
+        self.domain_id = DOMAIN_ID_BASE + index
+        self.partition = f"tb3_{os.getpid()}_{index}"
+        self.env = dict(os.environ, GZ_PARTITION=self.partition, ROS_DOMAIN_ID=str(self.domain_id))
+        self.command = ["ros2", "launch", "turtlebot3_gazebo", LAUNCH_FILE, f"world:={world}",
+                        f"x_pose:={x_pose}", f"y_pose:={y_pose}", f"headless:={str(headless).lower()}"]
+        if physics:
+            self.command.append(f"physics:={physics}")
+        if robots:
+            self.command.append(f"robots:={robots}")
+        self.log_path = os.path.join(log_dir, f"sim_{index}.log")
+        self.process = None
+        self.status = "starting"
+        self.first_clock = None     # (wall time, sim time) of the first clock reading
+        self.last_clock = None      # (wall time, sim time) of the latest clock reading
+        self.stalled_polls = 0
+
+    def start(self):
+        with open(self.log_path, "w") as log:
+            self.process = subprocess.Popen(self.command, env=self.env, stdout=log, stderr=subprocess.STDOUT,
+                                            start_new_session=True)
+
+    def sim_time(self):
+        """
+        Return the instance's current simulation time in seconds, or None if no clock message arrived.
+        """
+        try:
+            result = subprocess.run(["gz", "topic", "-e", "-t", "/clock", "-n", "1"], env=self.env,
+                                    capture_output=True, text=True, timeout=CLOCK_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            return None
+        match = SIM_CLOCK.search(result.stdout)
+        if match is None:
+            return None
+        # Zero fields are omitted from the message
+        fields = dict(re.findall(r"(\w+):\s*(\d+)", match.group(1)))
+        return int(fields.get("sec", 0)) + int(fields.get("nsec", 0)) * 1e-9
+
+    def poll(self):
+        """
+        Update and return the health status.
+        """
+        if self.status.startswith("exited"):
+            return self.status
+        code = self.process.poll()
+        if code is not None:
+            self.status = f"exited ({code})"
+            return self.status
+
+        sim_time = self.sim_time()
+        if sim_time is None:
+            progressed = False
+        else:
+            progressed = self.last_clock is None or sim_time > self.last_clock[1]
+            self.last_clock = (time.time(), sim_time)
+            if self.first_clock is None:
+                self.first_clock = self.last_clock
+
+        if progressed:
+            self.status = "running"
+            self.stalled_polls = 0
+        elif self.first_clock is not None:
+            self.stalled_polls += 1
+            if self.stalled_polls >= STALL_POLLS:
+                self.status = "stalled"
+        return self.status
+
+    def sim_seconds(self):
+        """
+        Return (simulated seconds, wall seconds) between the first and latest clock readings.
+        """
+        if self.first_clock is None:
+            return 0.0, 0.0
+        return self.last_clock[1] - self.first_clock[1], self.last_clock[0] - self.first_clock[0]
+
+    def stop(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+        os.killpg(self.process.pid, signal.SIGINT)
+        try:
+            self.process.wait(timeout=SHUTDOWN_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+
+# ==========================
+# Run and summarize
+# ==========================
+def run_parallel(instances, duration, poll_period=POLL_PERIOD):
+    """
+    Start every instance, health-check them every poll_period seconds for `duration` wall seconds
+    (or until all have exited / Ctrl-C), stop them, and return the summary rows.
+    """
+    for instance in instances:
+        instance.start()
+    start = time.time()
+    try:
+        while time.time() - start < duration:
+            time.sleep(min(poll_period, max(0.0, duration - (time.time() - start))))
+            statuses = [instance.poll() for instance in instances]
+            elapsed = time.time() - start
+            print(f"[{elapsed:7.1f} s] " + "  ".join(f"{i.index}:{s}" for i, s in zip(instances, statuses)))
+            if all(status.startswith("exited") for status in statuses):
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for instance in instances:
+            instance.stop()
+
+    rows = []
+    for instance in instances:
+        sim_seconds, wall_seconds = instance.sim_seconds()
+        rows.append({"index": instance.index, "world": instance.label, "domain_id": instance.domain_id,
+                     "partition": instance.partition, "status": instance.status, "sim_seconds": sim_seconds,
+                     "wall_seconds": wall_seconds, "log": instance.log_path})
+    return rows
+
+def print_summary(rows):
+    """
+    Print per-instance status and real time factor, then the aggregate sim-seconds per wall-second.
+    """
+    print(f"\n{'#':>3} {'world':<28}{'domain':>7}{'status':>14}{'sim [s]':>10}{'RTF':>8}")
+    for row in rows:
+        rtf = row["sim_seconds"] / row["wall_seconds"] if row["wall_seconds"] else 0.0
+        print(f"{row['index']:>3} {row['world']:<28}{row['domain_id']:>7}{row['status']:>14}"
+              f"{row['sim_seconds']:>10.1f}{rtf:>8.2f}")
+    wall = max((row["wall_seconds"] for row in rows), default=0.0)
+    total = sum(row["sim_seconds"] for row in rows)
+    if wall:
+        print(f"\nAggregate: {total:.1f} sim-seconds in {wall:.1f} wall-seconds = {total / wall:.2f} sim-s per wall-s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run N isolated maze simulations side by side.")
+    parser.add_argument("--instances", type=int, required=True, help="number of simulations to run")
+    parser.add_argument("--worlds", nargs="+", help="world files to run (cycled over the instances); "
+                        "default: one generated maze per instance with seeds --seed .. --seed+N-1")
+    parser.add_argument("--seed", type=int, default=0, help="first maze seed")
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE, help="maze size of generated worlds")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="directory of cached worlds")
+    parser.add_argument("--x-pose", type=float, default=0.0, help="spawn x for --worlds")
+    parser.add_argument("--y-pose", type=float, default=0.0, help="spawn y for --worlds")
+    parser.add_argument("--duration", type=float, default=60.0, help="wall seconds to run for")
+    parser.add_argument("--gui", action="store_true", help="run with gzclient instead of headless")
+    parser.add_argument("--physics", choices=sorted(PHYSICS_PROFILES),
+                        help="physics profile to run every world with (default: the world's own)")
+    parser.add_argument("--log-dir", default="parallel_sims", help="per-instance launch logs")
+    parser.add_argument("--output", help="also write the summary as JSON")
+    args = parser.parse_args()
+
+    for tool in ("ros2", "gz"):
+        if shutil.which(tool) is None:
+            parser.error(f"`{tool}` was not found on PATH; source your ROS 2 / Gazebo installation first")
+    if "TURTLEBOT3_MODEL" not in os.environ:
+        parser.error("set TURTLEBOT3_MODEL (e.g. burger) first")
+    if DOMAIN_ID_BASE + args.instances - 1 > MAX_DOMAIN_ID:
+        parser.error(f"at most {MAX_DOMAIN_ID - DOMAIN_ID_BASE + 1} instances (one ROS_DOMAIN_ID each)")
+
+    os.makedirs(args.log_dir, exist_ok=True)
+    instances = []
+    if args.worlds:
+        for index, world in zip(range(args.instances), itertools.cycle(args.worlds)):
+            instances.append(SimInstance(index, os.path.abspath(world), args.x_pose, args.y_pose, args.log_dir,
+                                         not args.gui, physics=args.physics))
+    else:
+        # Spawn in the middle cell, not on the wall corner at the origin of even-sized mazes
+        x_pose, y_pose = cell_center_position(args.grid_size // 2, args.grid_size // 2, args.grid_size)
+        for index in range(args.instances):
+            world, _, _ = cached_maze_world(args.cache_dir, seed=args.seed + index, grid_size=args.grid_size,
+                                            verbose=False)
+            instances.append(SimInstance(index, world, x_pose, y_pose, args.log_dir, not args.gui,
+                                         label=f"maze seed {args.seed + index}", physics=args.physics))
+
+    rows = run_parallel(instances, args.duration)
+    print_summary(rows)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(rows, file, indent=2)
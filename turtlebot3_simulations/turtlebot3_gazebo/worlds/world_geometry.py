@@ -0,0 +1,117 @@
+import math
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+# ==========================
+# Pose helpers (2D: x, y, yaw)
+# ==========================
+def parse_pose(element):
+    """
+    Return the (x, y, yaw) of an element's <pose> child, or the identity pose if it has none.
+    """
+    pose = element.find("pose")
+    if pose is None or not pose.text or not pose.text.strip():
+        return 0.0, 0.0, 0.0
+    values = [float(value) for value in pose.text.split()]
+    yaw = values[5] if len(values) >= 6 else 0.0
+    return values[0], values[1], yaw
+
+def compose_pose(parent, child):
+    """
+    Express a child pose, given relative to parent, in the parent's frame of reference.
+    """
+    px, py, pyaw = parent
+    cx, cy, cyaw = child
+    cos_yaw, sin_yaw = math.cos(pyaw), math.sin(pyaw)
+    return px + cos_yaw * cx - sin_yaw * cy, py + sin_yaw * cx + cos_yaw * cy, pyaw + cyaw
+
+# ==========================
+# Wall boxes of a world file
+# ==========================
+def _resolve_include(include, model_dirs):
+    """
+    Return the <model> element of a model://<name>[/<sub model>] include, or None if no directory
+    of model_dirs holds it (Fuel URIs and models from other packages are never resolved).
+    """
+    uri = (include.findtext("uri") or "").strip()
+    if not uri.startswith("model://"):
+        return None
+    for model_dir in model_dirs:
+        path = os.path.join(model_dir, uri[len("model://"):], "model.sdf")
+        if os.path.exists(path):
+            return ET.parse(path).getroot().find("model")
+    return None
+
+def _model_boxes(model, parent_pose, boxes, model_dirs=(), cylinders=False, model_pose=None):
+    """
+    Append the world-frame (x, y, size_x, size_y, yaw) of every box collision in a model,
+    including nested models and (with model_dirs) included ones. With cylinders, cylinder
+    collisions are added too, as their bounding square. model_pose overrides the model's own pose.
+    """
+    model_pose = compose_pose(parent_pose, parse_pose(model) if model_pose is None else model_pose)
+    for link in model.findall("link"):
+        link_pose = compose_pose(model_pose, parse_pose(link))
+        for collision in link.findall("collision"):
+            size = collision.find("geometry/box/size")
+            radius = collision.findtext("geometry/cylinder/radius")
+            if size is not None:
+                size_x, size_y = (float(value) for value in size.text.split()[:2])
+            elif cylinders and radius is not None:
+                size_x = size_y = 2.0 * float(radius)
+            else:
+                continue
+            x, y, yaw = compose_pose(link_pose, parse_pose(collision))
+            boxes.append((x, y, size_x, size_y, yaw))
+    for child in model.findall("model"):
+        _model_boxes(child, model_pose, boxes, model_dirs, cylinders)
+    for include in model.findall("include"):
+        _include_boxes(include, model_pose, boxes, model_dirs, cylinders)
+
+def _include_boxes(include, parent_pose, boxes, model_dirs, cylinders):
+    """
+    Append the boxes of an included model, placed at the include's pose (or its own if the include has none).
+    """
+    model = _resolve_include(include, model_dirs)
+    if model is None:
+        return
+    pose = parse_pose(include) if include.find("pose") is not None else parse_pose(model)
+    _model_boxes(model, parent_pose, boxes, model_dirs, cylinders, pose)
+
+def read_wall_boxes(world_path, model_dirs=(), cylinders=False):
+    """
+    Return an (N, 5) array of x, y, size_x, size_y, yaw for every box collision in the world's
+    models, in world coordinates. Works for both maze layouts (a model per wall, or one
+    "maze" model with posed collisions). The file is parsed in one streaming pass and each
+    model is discarded once read, so memory stays small even for very large worlds.
+    Included models (<include><uri>model://...) are only resolved against model_dirs, e.g. the
+    package's models directory for the DQN stage worlds. With cylinders, cylinder collisions
+    (the DQN obstacles) are returned too, as boxes the size of their bounding square.
+    """
+    boxes = []
+    depth = 0
+    for event, element in ET.iterparse(world_path, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        # <sdf> is depth 0 once closed, <world> 1, models directly in the world 2
+        if element.tag == "model" and depth == 2:
+            _model_boxes(element, (0.0, 0.0, 0.0), boxes, model_dirs, cylinders)
+            element.clear()
+        elif element.tag == "include" and depth == 2 and model_dirs:
+            _include_boxes(element, (0.0, 0.0, 0.0), boxes, model_dirs, cylinders)
+            element.clear()
+    return np.array(boxes, dtype=float).reshape(-1, 5)
+
+def box_footprints(boxes):
+    """
+    Return the axis-aligned footprint (x_min, x_max, y_min, y_max) of each box, as four arrays.
+    Rotated boxes get the bounding box of their rotated rectangle.
+    """
+    x, y, size_x, size_y, yaw = boxes.T
+    cos_yaw, sin_yaw = np.abs(np.cos(yaw)), np.abs(np.sin(yaw))
+    half_x = (cos_yaw * size_x + sin_yaw * size_y) / 2.0
+    half_y = (sin_yaw * size_x + cos_yaw * size_y) / 2.0
+    return x - half_x, x + half_x, y - half_y, y + half_y